@@ -1,13 +1,17 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from admin_hub.admin_lists import CachedAllValuesFieldListFilter, EstimatedCountPaginator
 from .models import User, ActivityLog
+from .resolver import bump_auth_version
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = ("userid", "full_name", "email", "department", "is_root", "is_staff", "is_active")
-    list_filter = ("is_root", "is_staff", "is_active", "department")
+    list_filter = ("is_root", "is_staff", "is_active", ("department", CachedAllValuesFieldListFilter))
     search_fields = ("userid", "full_name", "email", "department")
     ordering = ("userid",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         (None, {"fields": ("userid", "password")}),
@@ -25,13 +29,22 @@ class UserAdmin(BaseUserAdmin):
     
     readonly_fields = ("last_login",)
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change:
+            # Tokens carry department/name/root claims; make them reload
+            bump_auth_version(obj)
+
 @admin.register(ActivityLog)
 class ActivityLogAdmin(admin.ModelAdmin):
-    list_display = ("timestamp", "performed_by", "action", "target_user", "ip_address")
-    list_filter = ("action", "timestamp")
+    list_display = ("timestamp", "performed_by", "department", "action", "target_user", "ip_address")
+    list_filter = ("action", ("department", CachedAllValuesFieldListFilter), "timestamp")
     search_fields = ("performed_by__userid", "target_user", "details")
     ordering = ("-timestamp",)
-    readonly_fields = ("timestamp", "performed_by", "target_user", "action", "details", "ip_address")
+    list_select_related = ("performed_by",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = ("timestamp", "performed_by", "target_user", "department", "action", "details", "ip_address")
     
     def has_add_permission(self, request):
         # Prevent manual creation of logs through admin
@@ -0,0 +1,229 @@
+"""
+Retention for ActivityLog: old rows move to gzip-compressed NDJSON files,
+one or more parts per calendar month, then are deleted from the table.
+
+Archives live in a local directory or under a prefix of the S3 bucket
+(ACTIVITY_ARCHIVE_BACKEND). A part is named after the id range it holds,
+so a rerun that finds late rows for an archived month adds a new part
+instead of overwriting the old one, and skips rows an existing part
+already holds (left behind when a run stopped before deleting them).
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from admin_hub import s3 as s3_clients
+from admin_hub.pagination import iter_by_id
+
+from .models import ActivityLog
+
+ARCHIVE_FIELDS = [
+    "id",
+    "performed_by_id",
+    "performed_by__userid",
+    "target_user",
+    "department",
+    "action",
+    "timestamp",
+    "details",
+    "ip_address",
+]
+PART_SUFFIX = ".ndjson.gz"
+
+
+class DiskArchive:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def parts(self, month):
+        month_dir = os.path.join(self.directory, month)
+        try:
+            names = os.listdir(month_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(n for n in names if n.endswith(PART_SUFFIX))
+
+    def store(self, month, name, fileobj):
+        month_dir = os.path.join(self.directory, month)
+        os.makedirs(month_dir, exist_ok=True)
+        # Copy to a temp file and rename, so a part is either whole or absent
+        fd, tmp_path = tempfile.mkstemp(dir=month_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(fileobj, f)
+            os.replace(tmp_path, os.path.join(month_dir, name))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def open(self, month, name):
+        return open(os.path.join(self.directory, month, name), "rb")
+
+
+class S3Archive:
+    def __init__(self, bucket, prefix):
+        self.bucket = bucket
+        self.prefix = prefix.rstrip("/")
+
+    def parts(self, month):
+        paginator = s3_clients.get_client().get_paginator("list_objects_v2")
+        month_prefix = f"{self.prefix}/{month}/"
+        names = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=month_prefix):
+            for obj in page.get("Contents", []):
+                name = obj["Key"][len(month_prefix):]
+                if name.endswith(PART_SUFFIX):
+                    names.append(name)
+        return sorted(names)
+
+    def store(self, month, name, fileobj):
+        s3_clients.get_client().upload_fileobj(
+            fileobj,
+            self.bucket,
+            f"{self.prefix}/{month}/{name}",
+            ExtraArgs={"ContentType": "application/gzip"},
+        )
+
+    def open(self, month, name):
+        obj = s3_clients.get_client().get_object(
+            Bucket=self.bucket, Key=f"{self.prefix}/{month}/{name}"
+        )
+        return obj["Body"]
+
+
+def get_archive():
+    backend = getattr(settings, "ACTIVITY_ARCHIVE_BACKEND", "disk")
+    if backend == "s3":
+        return S3Archive(
+            settings.AWS_STORAGE_BUCKET_NAME,
+            getattr(settings, "ACTIVITY_ARCHIVE_PREFIX", "activity-archive"),
+        )
+    return DiskArchive(settings.ACTIVITY_ARCHIVE_DIR)
+
+
+def month_start(moment):
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(start):
+    return month_start(start + timedelta(days=32))
+
+
+def archive_cutoff(retention_days):
+    """
+    Start of the month holding the retention horizon. Only months wholly
+    before it are archived, so each month is closed when it is written.
+    """
+    return month_start(timezone.localtime() - timedelta(days=retention_days))
+
+
+def months_before(cutoff):
+    """
+    Yields (label, start, end) for every month with rows before `cutoff`,
+    oldest first.
+    """
+    oldest = (
+        ActivityLog.objects.filter(timestamp__lt=cutoff)
+        .order_by("timestamp")
+        .values_list("timestamp", flat=True)
+        .first()
+    )
+    if oldest is None:
+        return
+
+    start = month_start(timezone.localtime(oldest))
+    while start < cutoff:
+        end = next_month(start)
+        yield start.strftime("%Y-%m"), start, end
+        start = end
+
+
+def part_ranges(archive, month):
+    """
+    Returns the (first_id, last_id) ranges held by the parts of `month`.
+    """
+    ranges = []
+    for name in archive.parts(month):
+        first, _, last = name[: -len(PART_SUFFIX)].partition("-")
+        ranges.append((int(first), int(last)))
+    return ranges
+
+
+def archive_month(archive, label, start, end, chunk_size=2000, delete_batch=1000):
+    """
+    Archives and deletes the rows of one month. Returns the number of rows
+    written.
+
+    Rows are deleted only after the part holding them has been stored, and
+    only up to the highest id read, so rows arriving meanwhile stay in the
+    table for the next run. Rows already inside an existing part's id range
+    are not written again, only deleted.
+    """
+    archived_ranges = part_ranges(archive, label)
+    rows = iter_by_id(
+        ActivityLog.objects.filter(timestamp__gte=start, timestamp__lt=end).values(
+            *ARCHIVE_FIELDS
+        ),
+        chunk_size,
+        itemgetter("id"),
+    )
+
+    count = 0
+    first_id = last_id = max_id = None
+    with tempfile.TemporaryFile() as spool:
+        with gzip.GzipFile(fileobj=spool, mode="wb") as gz:
+            for row in rows:
+                max_id = row["id"]
+                if any(lo <= row["id"] <= hi for lo, hi in archived_ranges):
+                    continue
+                gz.write(json.dumps(row, cls=DjangoJSONEncoder).encode() + b"\n")
+                if first_id is None:
+                    first_id = row["id"]
+                last_id = row["id"]
+                count += 1
+
+        if max_id is None:
+            return 0
+
+        if count:
+            spool.seek(0)
+            archive.store(label, f"{first_id:012d}-{last_id:012d}{PART_SUFFIX}", spool)
+
+    archived = ActivityLog.objects.filter(
+        timestamp__gte=start, timestamp__lt=end, id__lte=max_id
+    )
+    while True:
+        ids = list(archived.order_by("id").values_list("id", flat=True)[:delete_batch])
+        if not ids:
+            break
+        ActivityLog.objects.filter(id__in=ids).delete()
+
+    return count
+
+
+def iter_archived_month(archive, month):
+    """
+    Yields the NDJSON lines (bytes) archived for `month` ("YYYY-MM"), in
+    id order, decompressing one part at a time.
+    """
+    datetime.strptime(month, "%Y-%m")  # raises ValueError on bad input
+
+    for name in archive.parts(month):
+        stream = archive.open(month, name)
+        try:
+            with gzip.GzipFile(fileobj=stream, mode="rb") as gz:
+                yield from gz
+        finally:
+            stream.close()
@@ -0,0 +1,129 @@
+"""
+Buffered writer for ActivityLog entries.
+
+Requests only append the entry to an in-memory buffer. A background
+thread writes the buffer with one bulk_create once it holds
+AUDIT_LOG_BATCH_SIZE entries or AUDIT_LOG_FLUSH_INTERVAL seconds have
+passed, and whatever is left is written when the worker exits. A batch
+the database rejects is retried row by row, so only the offending rows
+are lost.
+AUDIT_LOG_MODE = "sync" writes each entry inside the request instead.
+"""
+
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogWriter:
+    def __init__(self, batch_size=200, flush_interval=2.0, max_pending=10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = []
+        self._lock = threading.Lock()
+        # Held while writing, so flushes never run concurrently
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add(self, entry):
+        self._ensure_thread()
+        with self._lock:
+            self._pending.append(entry)
+            pending = len(self._pending)
+
+        if pending >= self.max_pending:
+            # The flusher has fallen behind (e.g. the database is down);
+            # write from the request rather than grow without bound
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                entries, self._pending = self._pending, []
+            if not entries:
+                return
+
+            for start in range(0, len(entries), self.batch_size):
+                self._write(entries[start : start + self.batch_size])
+
+    def _write(self, batch):
+        try:
+            ActivityLog.objects.bulk_create(batch)
+            return
+        except Exception:
+            logger.warning(
+                "Batch of %d activity log entries failed; retrying one by one",
+                len(batch),
+                exc_info=True,
+            )
+
+        # One bad row (e.g. its performer was deleted meanwhile) must not
+        # take the rest of the batch with it
+        dropped = 0
+        for entry in batch:
+            try:
+                ActivityLog.objects.bulk_create([entry])
+            except Exception:
+                dropped += 1
+                logger.exception(
+                    "Dropped activity log entry %s on %s",
+                    entry.action,
+                    entry.target_user,
+                )
+        if dropped:
+            logger.error("Dropped %d of %d activity log entries", dropped, len(batch))
+
+    def _ensure_thread(self):
+        # Started lazily, and again in a forked worker where it doesn't exist
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="audit-log-writer", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+
+audit_log = AuditLogWriter(
+    batch_size=getattr(settings, "AUDIT_LOG_BATCH_SIZE", 200),
+    flush_interval=getattr(settings, "AUDIT_LOG_FLUSH_INTERVAL", 2.0),
+    max_pending=getattr(settings, "AUDIT_LOG_MAX_PENDING", 10000),
+)
+atexit.register(audit_log.flush)
+
+
+def client_ip(request):
+    x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if x_forwarded_for:
+        return x_forwarded_for.split(",")[0]
+    return request.META.get("REMOTE_ADDR")
+
+
+def record(entry):
+    if getattr(settings, "AUDIT_LOG_MODE", "buffered") == "sync":
+        entry.save()
+    else:
+        audit_log.add(entry)
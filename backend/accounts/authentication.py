@@ -2,19 +2,43 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework import serializers
 
+from .audit import client_ip, record
+from .models import ActivityLog
+from .resolver import USER_CLAIMS, VERSION_CLAIM
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[VERSION_CLAIM] = user.auth_version
+        return token
+
     def validate(self, attrs):
         # Get the user
         data = super().validate(attrs)
-        
+
         # Check if user is active
         if not self.user.is_active:
             raise serializers.ValidationError(
                 "Your account has been deactivated by the root administrator. "
                 "Please contact your system administrator for assistance."
             )
-        
+
+        request = self.context.get("request")
+        record(
+            ActivityLog(
+                performed_by=self.user,
+                target_user=self.user.userid,
+                department=self.user.department,
+                action="login",
+                ip_address=client_ip(request) if request else None,
+            )
+        )
+
         return data
 
 class CustomTokenObtainPairView(TokenObtainPairView):
-    serializer_class = CustomTokenObtainPairSerializer
\ No newline at end of file
+    serializer_class = CustomTokenObtainPairSerializer
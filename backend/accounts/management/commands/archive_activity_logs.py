@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from accounts.archive import archive_cutoff, archive_month, get_archive, months_before
+from accounts.models import ActivityLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves activity logs older than the retention horizon into monthly "
+        "compressed NDJSON archives and deletes them from the table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=getattr(settings, "ACTIVITY_LOG_RETENTION_DAYS", 365),
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--delete-batch", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows each month would archive",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff(options["retention_days"])
+        archive = get_archive()
+
+        total = 0
+        for label, start, end in months_before(cutoff):
+            if options["dry_run"]:
+                count = ActivityLog.objects.filter(
+                    timestamp__gte=start, timestamp__lt=end
+                ).aggregate(n=Count("id"))["n"]
+            else:
+                count = archive_month(
+                    archive,
+                    label,
+                    start,
+                    end,
+                    chunk_size=options["chunk_size"],
+                    delete_batch=options["delete_batch"],
+                )
+            if count:
+                self.stdout.write(f"{label}: {count} rows")
+            total += count
+
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {total} activity logs before {cutoff:%Y-%m-%d}")
+        )
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from accounts.models import ActivityLog, User
+
+
+class Command(BaseCommand):
+    help = "Copies performed_by's department onto activity logs that lack one"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        department = Subquery(
+            User.objects.filter(pk=OuterRef("performed_by_id")).values(
+                "department"
+            )[:1]
+        )
+
+        # Walk the primary key in ranges so each UPDATE stays short and
+        # the command can be stopped and rerun at any point
+        last_id = 0
+        updated = 0
+        while True:
+            ids = list(
+                ActivityLog.objects.filter(
+                    id__gt=last_id,
+                    department="",
+                    performed_by__isnull=False,
+                )
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            updated += ActivityLog.objects.filter(id__in=ids).update(
+                department=department
+            )
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} activity logs"))
@@ -0,0 +1,38 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.archive import get_archive, iter_archived_month
+
+
+class Command(BaseCommand):
+    help = "Streams the archived activity logs of one month as NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("month", help="Month to read, as YYYY-MM")
+        parser.add_argument(
+            "--output", default="-", help="Output path, '-' for stdout"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            lines = iter_archived_month(get_archive(), options["month"])
+            first = next(lines, None)
+        except ValueError:
+            raise CommandError("month must look like YYYY-MM")
+
+        if first is None:
+            raise CommandError(f"No archive for {options['month']}")
+
+        out = (
+            sys.stdout.buffer
+            if options["output"] == "-"
+            else open(options["output"], "wb")
+        )
+        try:
+            out.write(first)
+            for line in lines:
+                out.write(line)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
 class UserManager(BaseUserManager):
@@ -31,6 +32,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_root = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Bumped whenever token claims or the account status go stale
+    auth_version = models.PositiveIntegerField(default=0)
     objects = UserManager()
 
     USERNAME_FIELD = "userid"
@@ -51,13 +54,24 @@ class ActivityLog(models.Model):
     
     performed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='actions_performed')
     target_user = models.CharField(max_length=6)
+    # Copied from performed_by so department listings need no join
+    department = models.CharField(max_length=100, blank=True)
     action = models.CharField(max_length=20, choices=ACTION_CHOICES)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is made, not when the buffered writer saves it
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     details = models.TextField(blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Unfiltered admin changelist order and archival range scans
+            models.Index(fields=['-timestamp', '-id'], name='activitylog_time_idx'),
+            models.Index(
+                fields=['department', '-timestamp', '-id'],
+                name='activitylog_dept_time_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.performed_by} - {self.action} - {self.target_user}"
\ No newline at end of file
@@ -0,0 +1,12 @@
+from admin_hub.pagination import KeysetPagination
+
+
+class ActivityLogPagination(KeysetPagination):
+    """
+    Keyset pagination of activity logs over (-timestamp, -id), served by
+    the (department, timestamp, id) index.
+    """
+
+    date_field = "timestamp"
+    page_size_setting = "ACTIVITY_LOG_PAGE_SIZE"
+    max_page_size_setting = "ACTIVITY_LOG_MAX_PAGE_SIZE"
@@ -0,0 +1,140 @@
+"""
+Request-time user resolution from JWT claims.
+
+Kept apart from the token views: DRF reads DEFAULT_AUTHENTICATION_CLASSES
+while its view classes are being defined, so the authentication class
+must live in a module that doesn't import any views.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# User fields copied into tokens; views that only read these never need
+# the user row
+USER_CLAIMS = ("userid", "department", "is_root", "full_name")
+VERSION_CLAIM = "auth_version"
+
+
+class UserStateCache:
+    """
+    Per-process TTL cache of each user's (is_active, auth_version).
+
+    This is all a request needs from the database when its token carries
+    the user claims, so within the TTL requests run no user query at
+    all. Changes made in another worker are seen once the entry expires,
+    which bounds how long a deactivated user keeps access.
+    """
+
+    def __init__(self, ttl=30, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pk):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pk)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(pk)
+                return entry[0], entry[1]
+
+        state = (
+            get_user_model()
+            .objects.filter(pk=pk)
+            .values_list("is_active", "auth_version")
+            .first()
+        )
+        if state is None:
+            return None
+
+        with self._lock:
+            self._entries[pk] = (*state, now + self.ttl)
+            self._entries.move_to_end(pk)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return state
+
+    def forget(self, pk):
+        with self._lock:
+            self._entries.pop(pk, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_states = UserStateCache(ttl=getattr(settings, "USER_STATE_CACHE_TTL", 30))
+
+
+def bump_auth_version(user):
+    """
+    Invalidates the claims in every token issued to `user` so far; call
+    after changing anything the tokens carry or the account's status.
+    """
+    User = get_user_model()
+    User.objects.filter(pk=user.pk).update(auth_version=F("auth_version") + 1)
+    user_states.forget(user.pk)
+
+
+def user_from_claims(pk, token):
+    """
+    Builds the user from token claims. Fields not in the token are
+    deferred, so reading them (e.g. email) loads them on first access and
+    save() only ever writes the claim fields.
+    """
+    User = get_user_model()
+    loaded = {"id": pk, "is_active": True}
+    loaded.update((claim, token[claim]) for claim in USER_CLAIMS)
+
+    names = [f.attname for f in User._meta.concrete_fields if f.attname in loaded]
+    return User.from_db(DEFAULT_DB_ALIAS, names, [loaded[n] for n in names])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from token claims instead of
+    loading the row on every request.
+
+    Tokens whose auth_version is behind the user's current one (or that
+    predate the claims) fall back to a full user load, as do the checks
+    simplejwt would otherwise make against the row.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        User = get_user_model()
+        try:
+            pk = User._meta.pk.to_python(user_id)
+        except Exception:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        state = user_states.get(pk)
+        if state is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        is_active, auth_version = state
+        if not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        claims_current = (
+            validated_token.get(VERSION_CLAIM) == auth_version
+            and all(claim in validated_token for claim in USER_CLAIMS)
+        )
+        if claims_current and not api_settings.CHECK_REVOKE_TOKEN:
+            return user_from_claims(pk, validated_token)
+
+        return super().get_user(validated_token)
@@ -1,3 +1,239 @@
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from .archive import DiskArchive, archive_month, iter_archived_month
+from .audit import AuditLogWriter
+from .authentication import CustomTokenObtainPairSerializer
+from .models import ActivityLog, User
+from .resolver import CachedJWTAuthentication, bump_auth_version, user_states
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_states.clear()
+        self.user = User.objects.create_user(
+            "OFF001",
+            password="pw",
+            department="Roads",
+            full_name="Asha Rao",
+            email="asha@example.com",
+        )
+        self.auth = CachedJWTAuthentication()
+
+    def token_for(self, user):
+        return CustomTokenObtainPairSerializer.get_token(user).access_token
+
+    def test_claims_path_runs_no_user_query(self):
+        token = self.token_for(self.user)
+        self.auth.get_user(token)  # fills the state cache
+
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(token)
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.userid, "OFF001")
+        self.assertEqual(user.department, "Roads")
+        self.assertFalse(user.is_root)
+        self.assertIn("email", user.get_deferred_fields())
+
+    def test_bumped_version_falls_back_to_full_load(self):
+        token = self.token_for(self.user)
+        User.objects.filter(pk=self.user.pk).update(department="Water")
+        bump_auth_version(self.user)
+
+        # One query for the cached state, one for the full row
+        with self.assertNumQueries(2):
+            user = self.auth.get_user(token)
+
+        self.assertEqual(user.department, "Water")
+        self.assertEqual(user.get_deferred_fields(), set())
+
+    def test_inactive_user_is_rejected(self):
+        token = self.token_for(self.user)
+        self.auth.get_user(token)
+
+        self.user.is_active = False
+        self.user.save()
+        bump_auth_version(self.user)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(token)
+
+    def test_deleted_user_is_rejected(self):
+        token = self.token_for(self.user)
+        self.auth.get_user(token)
+
+        root = User.objects.create_user(
+            "ROOT01", password="pw", is_root=True, department="Roads"
+        )
+        client = APIClient()
+        client.force_authenticate(root)
+        response = client.delete("/api/users/OFF001/delete/")
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(token)
+
+
+class ActivityLogsViewTests(TestCase):
+    def setUp(self):
+        self.root = User.objects.create_user(
+            "ROOT01", password="pw", is_root=True, department="Roads"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.root)
+        self.start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+    def log(self, action, target_user="OFF001", department="Roads", minutes=0):
+        entry = ActivityLog.objects.create(
+            performed_by=self.root,
+            target_user=target_user,
+            department=department,
+            action=action,
+        )
+        ActivityLog.objects.filter(pk=entry.pk).update(
+            timestamp=self.start + timedelta(minutes=minutes)
+        )
+        return entry.pk
+
+    def get_ids(self, **params):
+        response = self.client.get("/api/activity-logs/", params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        rows = data["results"] if "results" in data else data
+        return [row["id"] for row in rows]
+
+    def test_lists_only_own_department(self):
+        mine = self.log("create")
+        self.log("create", department="Water")
+
+        self.assertEqual(self.get_ids(), [mine])
+
+    def test_action_filter(self):
+        created = self.log("create")
+        self.log("delete")
+
+        self.assertEqual(self.get_ids(action="create"), [created])
+        response = self.client.get("/api/activity-logs/", {"action": "bogus"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_target_user_filter(self):
+        self.log("create", target_user="OFF001")
+        other = self.log("create", target_user="OFF002")
+
+        self.assertEqual(self.get_ids(target_user="OFF002"), [other])
+
+    def test_since_until_filters(self):
+        self.log("login", minutes=0)
+        middle = self.log("login", minutes=10)
+        self.log("login", minutes=20)
+
+        ids = self.get_ids(
+            since=(self.start + timedelta(minutes=5)).isoformat(),
+            until=(self.start + timedelta(minutes=20)).isoformat(),
+        )
+        self.assertEqual(ids, [middle])
+        response = self.client.get("/api/activity-logs/", {"since": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_continues_where_the_page_ended(self):
+        # Two entries share a timestamp, so the id tie-break is exercised
+        ids = [self.log("login", minutes=m) for m in [0, 1, 1, 2, 3]]
+        expected = ids[::-1]
+
+        seen, cursor = [], None
+        while True:
+            params = {"page_size": 2}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.client.get("/api/activity-logs/", params).json()
+            seen += [row["id"] for row in data["results"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(seen, expected)
+
+
+class BackfillActivityDepartmentsTests(TestCase):
+    def test_copies_performer_department_onto_blank_rows(self):
+        user = User.objects.create_user("OFF001", password="pw", department="Roads")
+        blank = ActivityLog.objects.create(
+            performed_by=user, target_user="OFF001", action="login"
+        )
+        kept = ActivityLog.objects.create(
+            performed_by=user,
+            target_user="OFF001",
+            action="login",
+            department="Water",
+        )
+        orphan = ActivityLog.objects.create(target_user="OFF001", action="login")
+
+        out = StringIO()
+        call_command("backfill_activity_departments", batch_size=1, stdout=out)
+
+        departments = dict(ActivityLog.objects.values_list("id", "department"))
+        self.assertEqual(
+            departments, {blank.pk: "Roads", kept.pk: "Water", orphan.pk: ""}
+        )
+        self.assertIn("Backfilled 1 activity logs", out.getvalue())
+
+
+class AuditLogWriterTests(TestCase):
+    def test_failed_batch_keeps_its_good_rows(self):
+        user = User.objects.create_user("OFF001", password="pw", department="Roads")
+        entries = [
+            ActivityLog(performed_by=user, target_user=userid, action="login")
+            for userid in ["OFF001", "BAD001", "OFF002"]
+        ]
+        bulk_create = ActivityLog.objects.bulk_create
+
+        def reject_bad_rows(batch, *args, **kwargs):
+            if any(entry.target_user == "BAD001" for entry in batch):
+                raise IntegrityError("rejected")
+            return bulk_create(batch, *args, **kwargs)
+
+        writer = AuditLogWriter()
+        writer._pending = entries
+        with mock.patch.object(
+            ActivityLog.objects, "bulk_create", side_effect=reject_bad_rows
+        ), self.assertLogs("accounts.audit", "ERROR"):
+            writer.flush()
+
+        self.assertEqual(
+            sorted(ActivityLog.objects.values_list("target_user", flat=True)),
+            ["OFF001", "OFF002"],
+        )
+
+
+class ArchiveMonthTests(TestCase):
+    def test_rerun_after_interrupted_delete_writes_no_duplicates(self):
+        start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        end = datetime(2024, 2, 1, tzinfo=dt_timezone.utc)
+        for userid in ["OFF001", "OFF002", "OFF003"]:
+            entry = ActivityLog.objects.create(target_user=userid, action="login")
+            ActivityLog.objects.filter(pk=entry.pk).update(timestamp=start)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        archive = DiskArchive(directory.name)
+
+        # A run that stored its part but died before deleting leaves the
+        # archived rows behind
+        rows = list(ActivityLog.objects.all())
+        self.assertEqual(archive_month(archive, "2024-01", start, end), 3)
+        ActivityLog.objects.bulk_create(rows)
+        late = ActivityLog.objects.create(target_user="OFF004", action="login")
+        ActivityLog.objects.filter(pk=late.pk).update(timestamp=start)
 
-# Create your tests here.
+        self.assertEqual(archive_month(archive, "2024-01", start, end), 1)
+        self.assertEqual(len(list(iter_archived_month(archive, "2024-01"))), 4)
+        self.assertFalse(ActivityLog.objects.exists())
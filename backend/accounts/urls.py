@@ -1,15 +1,17 @@
 from django.urls import path
 from .views import (
-    RegisterView, MeView, PresignS3UploadView, 
+    RegisterView, MeView, LogoutView, PresignS3UploadView, 
     DeleteUserView, ListUsersView, ToggleUserStatusView, ActivityLogsView
 )
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .authentication import CustomTokenObtainPairView
+from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("register/", RegisterView.as_view(), name="register"),
     path("me/", MeView.as_view(), name="me"),
+    path("logout/", LogoutView.as_view(), name="logout"),
     path("presign-s3/", PresignS3UploadView.as_view(), name="presign-s3"),
     
     path("users/", ListUsersView.as_view(), name="list_users"),
@@ -8,25 +8,25 @@ from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError
 from django.conf import settings
 from .models import ActivityLog
-import boto3
+from .resolver import bump_auth_version, user_states
+from .audit import client_ip, record
+from .pagination import ActivityLogPagination
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from admin_hub import s3 as s3_clients
 import uuid
 import os
 
 def log_activity(performed_by, target_user, action, details="", request=None):
-    ip_address = None
-    if request:
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip_address = x_forwarded_for.split(',')[0]
-        else:
-            ip_address = request.META.get('REMOTE_ADDR')
-    
-    ActivityLog.objects.create(
-        performed_by=performed_by,
-        target_user=target_user,
-        action=action,
-        details=details,
-        ip_address=ip_address
+    record(
+        ActivityLog(
+            performed_by=performed_by,
+            target_user=target_user,
+            department=performed_by.department if performed_by else "",
+            action=action,
+            details=details,
+            ip_address=client_ip(request) if request else None,
+        )
     )
 
 class RegisterView(generics.CreateAPIView):
@@ -53,6 +53,18 @@ class MeView(APIView):
         user = request.user
         return Response(UserSerializer(user).data)
 
+class LogoutView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        log_activity(
+            performed_by=request.user,
+            target_user=request.user.userid,
+            action='logout',
+            request=request
+        )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 class ListUsersView(APIView):
     permission_classes = [IsAuthenticated, IsRootUser]
 
@@ -94,7 +106,10 @@ class DeleteUserView(APIView):
                 request=request
             )
             
+            # delete() clears user.pk
+            pk = user.pk
             user.delete()
+            user_states.forget(pk)
             return Response(
                 {"message": f"User {userid} deleted successfully"},
                 status=status.HTTP_200_OK
@@ -128,6 +143,7 @@ class ToggleUserStatusView(APIView):
             
             user.is_active = not user.is_active
             user.save()
+            bump_auth_version(user)
             
             action = 'activate' if user.is_active else 'deactivate'
             log_activity(
@@ -152,10 +168,34 @@ class ActivityLogsView(APIView):
     permission_classes = [IsAuthenticated, IsRootUser]
 
     def get(self, request):
-        logs = ActivityLog.objects.filter(
-            performed_by__department=request.user.department
-        ).select_related('performed_by')[:100]
-        
+        logs = ActivityLog.objects.filter(department=request.user.department)
+
+        params = request.query_params
+        action = params.get("action")
+        if action:
+            if action not in dict(ActivityLog.ACTION_CHOICES):
+                raise ValidationError("Unknown action")
+            logs = logs.filter(action=action)
+        if params.get("target_user"):
+            logs = logs.filter(target_user=params["target_user"])
+        for param, lookup in (("since", "timestamp__gte"), ("until", "timestamp__lt")):
+            if params.get(param):
+                moment = parse_datetime(params[param])
+                if moment is None:
+                    raise ValidationError(f"{param} must be an ISO 8601 datetime")
+                if timezone.is_naive(moment):
+                    moment = timezone.make_aware(moment)
+                logs = logs.filter(**{lookup: moment})
+
+        logs = logs.select_related('performed_by')
+
+        paginator = ActivityLogPagination()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(logs, request, view=self)
+            serializer = ActivityLogSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        logs = logs.order_by('-timestamp', '-id')[:100]
         serializer = ActivityLogSerializer(logs, many=True)
         return Response(serializer.data)
 
@@ -172,12 +212,7 @@ class PresignS3UploadView(APIView):
         ext = os.path.splitext(file_name)[1]
         key = f"completion/{request.user.department}/{uuid.uuid4()}{ext}"
 
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
-        )
+        s3 = s3_clients.get_client(settings.AWS_S3_REGION_NAME)
 
         try:
             url = s3.generate_presigned_url(
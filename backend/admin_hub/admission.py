@@ -0,0 +1,132 @@
+"""
+Admission control for CPU-heavy views.
+
+Each named pool admits a fixed number of concurrent requests. Requests
+beyond that get an immediate 503 with Retry-After rather than queueing
+behind the busy ones, so cheap endpoints keep their workers.
+
+ADMISSION_BACKEND picks where the slots live:
+- "file" (default): lock files shared by every worker on the host
+  (flock), so the limit holds across gunicorn worker processes
+- "process": a semaphore per worker process, which only limits anything
+  when a worker serves requests on several threads
+"""
+
+import os
+import threading
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Server is busy, please retry shortly."
+    default_code = "overloaded"
+
+    def __init__(self, wait, detail=None):
+        super().__init__(detail)
+        # DRF's exception handler turns this into a Retry-After header
+        self.wait = wait
+
+
+class ProcessSlots:
+    def __init__(self, limit):
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    def acquire(self):
+        if self._semaphore.acquire(blocking=False):
+            return self._semaphore
+        return None
+
+    def release(self, token):
+        token.release()
+
+
+class FileSlots:
+    def __init__(self, name, limit, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.paths = [
+            os.path.join(directory, f"{name}.{n}.lock") for n in range(limit)
+        ]
+
+    def acquire(self):
+        for path in self.paths:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    def release(self, token):
+        try:
+            fcntl.flock(token, fcntl.LOCK_UN)
+        finally:
+            os.close(token)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name):
+    """
+    Returns the slot pool for `name`, or None when it has no limit.
+    """
+    limit = getattr(settings, "ADMISSION_LIMITS", {}).get(name)
+    if not limit:
+        return None
+
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                backend = getattr(settings, "ADMISSION_BACKEND", "file")
+                if backend == "file" and fcntl is not None:
+                    pool = FileSlots(name, limit, settings.ADMISSION_LOCK_DIR)
+                else:
+                    pool = ProcessSlots(limit)
+                _pools[name] = pool
+    return pool
+
+
+class AdmissionControlMixin:
+    """
+    APIView mixin limiting concurrent requests to `admission_pool`.
+
+    The slot is taken after authentication and permission checks, so
+    rejected requests never occupy one, and is released once the view
+    has produced its response.
+    """
+
+    admission_pool = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        pool = get_pool(self.admission_pool)
+        if pool is None:
+            return
+
+        token = pool.acquire()
+        if token is None:
+            raise Overloaded(wait=getattr(settings, "ADMISSION_RETRY_AFTER", 5))
+        self._admission_slot = (pool, token)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        slot = getattr(self, "_admission_slot", None)
+        if slot is not None:
+            self._admission_slot = None
+            pool, token = slot
+            pool.release(token)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,123 @@
+"""
+Process-wide S3 client registry and presigned GET URL cache.
+
+boto3 clients are thread-safe but expensive to build (endpoint data,
+credential chain), so each (region, profile) gets exactly one, shared by
+every request thread in the worker.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import boto3
+from botocore.config import Config
+from django.conf import settings
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def default_region():
+    return (
+        getattr(settings, "AWS_REGION", None)
+        or getattr(settings, "AWS_S3_REGION_NAME", None)
+        or "ap-south-1"
+    )
+
+
+def _client_config(profile):
+    pool = getattr(settings, "AWS_S3_MAX_POOL_CONNECTIONS", 20)
+    if profile == "read":
+        # Object reads enforce their own latency budget and retries, so
+        # each attempt fails fast and botocore doesn't retry on its own
+        return Config(
+            max_pool_connections=pool,
+            connect_timeout=getattr(settings, "S3_READ_CONNECT_TIMEOUT", 0.5),
+            read_timeout=getattr(settings, "S3_READ_TIMEOUT", 1),
+            retries={"max_attempts": 1, "mode": "standard"},
+            tcp_keepalive=True,
+        )
+    return Config(max_pool_connections=pool)
+
+
+def get_client(region_name=None, profile="default"):
+    """
+    Returns the shared client for `region_name`. `profile` selects the
+    client configuration: "default", or "read" for latency-bound reads.
+    """
+    region_name = region_name or default_region()
+    registry_key = (region_name, profile)
+
+    client = _clients.get(registry_key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(registry_key)
+        if client is None:
+            client = boto3.session.Session().client(
+                "s3",
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=region_name,
+                config=_client_config(profile),
+            )
+            _clients[registry_key] = client
+    return client
+
+
+def reset_clients():
+    """
+    Drops every cached client, e.g. in a child process that must not
+    reuse its parent's pooled connections.
+    """
+    with _clients_lock:
+        _clients.clear()
+
+
+class PresignedURLCache:
+    """
+    Thread-safe TTL cache of presigned GET URLs.
+
+    A URL is handed out again only while it is younger than a third of
+    its lifetime, so callers always get one with most of its validity
+    left. The cache is bounded and evicts the least recently used entry.
+    """
+
+    def __init__(self, max_entries=4096, reuse_fraction=1 / 3):
+        self.max_entries = max_entries
+        self.reuse_fraction = reuse_fraction
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_sign(self, bucket, key, expires_in, sign):
+        cache_key = (bucket, key, expires_in)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(cache_key)
+                return entry[0]
+
+        # Sign outside the lock; a duplicate signature is harmless
+        url = sign()
+
+        with self._lock:
+            self._entries[cache_key] = (
+                url,
+                now + expires_in * self.reuse_fraction,
+            )
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return url
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+presigned_urls = PresignedURLCache()
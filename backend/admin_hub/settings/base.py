@@ -68,7 +68,7 @@ AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.resolver.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -80,6 +80,92 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+# Seconds a worker trusts its cached copy of a user's active flag and
+# auth version; bounds how long a deactivation takes to apply everywhere
+USER_STATE_CACHE_TTL = int(os.environ.get("USER_STATE_CACHE_TTL", "30"))
+
+# Activity log writes: "buffered" batches them in a background thread,
+# "sync" writes each one inside the request
+AUDIT_LOG_MODE = os.environ.get("AUDIT_LOG_MODE", "buffered")
+AUDIT_LOG_BATCH_SIZE = int(os.environ.get("AUDIT_LOG_BATCH_SIZE", "200"))
+# Seconds an entry may wait in the buffer
+AUDIT_LOG_FLUSH_INTERVAL = float(os.environ.get("AUDIT_LOG_FLUSH_INTERVAL", "2"))
+# Past this many buffered entries, requests write the backlog themselves
+AUDIT_LOG_MAX_PENDING = int(os.environ.get("AUDIT_LOG_MAX_PENDING", "10000"))
+# Activity log pagination (opt-in via ?cursor= / ?page_size=)
+ACTIVITY_LOG_PAGE_SIZE = int(os.environ.get("ACTIVITY_LOG_PAGE_SIZE", "100"))
+ACTIVITY_LOG_MAX_PAGE_SIZE = int(os.environ.get("ACTIVITY_LOG_MAX_PAGE_SIZE", "500"))
+# Activity logs older than this many days are moved to monthly archives
+# by archive_activity_logs; "disk" or "s3" picks where the archives go
+ACTIVITY_LOG_RETENTION_DAYS = int(os.environ.get("ACTIVITY_LOG_RETENTION_DAYS", "365"))
+ACTIVITY_ARCHIVE_BACKEND = os.environ.get("ACTIVITY_ARCHIVE_BACKEND", "disk")
+ACTIVITY_ARCHIVE_DIR = os.environ.get("ACTIVITY_ARCHIVE_DIR", str(BASE_DIR / "archive" / "activity"))
+ACTIVITY_ARCHIVE_PREFIX = os.environ.get("ACTIVITY_ARCHIVE_PREFIX", "activity-archive")
+
+# Admin changelists count at most this many rows; larger unfiltered
+# tables show the MySQL row estimate instead
+ADMIN_COUNT_CAP = int(os.environ.get("ADMIN_COUNT_CAP", "10000"))
+# Seconds the distinct values behind admin list filters stay cached
+ADMIN_FILTER_CHOICES_TTL = int(os.environ.get("ADMIN_FILTER_CHOICES_TTL", "300"))
+
+# Issue list pagination (opt-in via ?cursor= / ?page_size=)
+ISSUE_PAGE_SIZE = int(os.environ.get("ISSUE_PAGE_SIZE", "50"))
+ISSUE_MAX_PAGE_SIZE = int(os.environ.get("ISSUE_MAX_PAGE_SIZE", "200"))
+# Beyond this many changed rows, ?updated_since= asks the client to reload
+ISSUE_DELTA_LIMIT = int(os.environ.get("ISSUE_DELTA_LIMIT", "1000"))
+# Seconds the delta watermark trails the clock, covering writes stamped
+# before they commit
+ISSUE_DELTA_GRACE = int(os.environ.get("ISSUE_DELTA_GRACE", "30"))
+# Seconds a department's dashboard summary stays cached
+ISSUE_SUMMARY_CACHE_TIMEOUT = int(os.environ.get("ISSUE_SUMMARY_CACHE_TIMEOUT", "30"))
+# Maximum tracking IDs accepted by the bulk status endpoint
+ISSUE_BULK_LIMIT = int(os.environ.get("ISSUE_BULK_LIMIT", "500"))
+# Maximum tracking IDs accepted by the batch detail endpoint
+ISSUE_BATCH_LIMIT = int(os.environ.get("ISSUE_BATCH_LIMIT", "100"))
+# Rows fetched per database round trip by exports
+ISSUE_EXPORT_CHUNK_SIZE = int(os.environ.get("ISSUE_EXPORT_CHUNK_SIZE", "2000"))
+# Parquet exports are built in memory up to this size, then on disk
+ISSUE_EXPORT_SPOOL_BYTES = int(os.environ.get("ISSUE_EXPORT_SPOOL_BYTES", str(8 * 1024 * 1024)))
+# "auto" uses the MySQL FULLTEXT index on MySQL (503 if it is missing) and
+# the in-process inverted index elsewhere; "memory" forces the latter
+ISSUE_SEARCH_BACKEND = os.environ.get("ISSUE_SEARCH_BACKEND", "auto")
+# Seconds between incremental refreshes of the in-process index
+ISSUE_SEARCH_REFRESH_INTERVAL = int(os.environ.get("ISSUE_SEARCH_REFRESH_INTERVAL", "5"))
+# Deepest result reachable through paging
+ISSUE_SEARCH_MAX_RESULTS = int(os.environ.get("ISSUE_SEARCH_MAX_RESULTS", "1000"))
+# Rendered briefing PDF cache: "disk", "s3" or "none"
+PDF_CACHE_BACKEND = os.environ.get("PDF_CACHE_BACKEND", "disk")
+PDF_CACHE_DIR = os.environ.get("PDF_CACHE_DIR", str(BASE_DIR / ".cache" / "pdf"))
+PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+PDF_CACHE_PREFIX = os.environ.get("PDF_CACHE_PREFIX", "pdf-cache")
+# Photos embedded in briefings: target DPI, JPEG quality and processed-image cache
+PDF_IMAGE_DPI = int(os.environ.get("PDF_IMAGE_DPI", "150"))
+PDF_IMAGE_QUALITY = int(os.environ.get("PDF_IMAGE_QUALITY", "80"))
+PDF_IMAGE_CACHE_DIR = os.environ.get("PDF_IMAGE_CACHE_DIR", str(BASE_DIR / ".cache" / "pdf-images"))
+PDF_IMAGE_CACHE_MAX_BYTES = int(os.environ.get("PDF_IMAGE_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# Briefing packs: issues per pack, render processes, in-memory spool size
+PDF_PACK_LIMIT = int(os.environ.get("PDF_PACK_LIMIT", "50"))
+PDF_PACK_WORKERS = int(os.environ.get("PDF_PACK_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PACK_SPOOL_BYTES = int(os.environ.get("PDF_PACK_SPOOL_BYTES", str(8 * 1024 * 1024)))
+# Async PDF jobs: attempts before failing, seconds before a running job is requeued
+PDF_JOB_MAX_ATTEMPTS = int(os.environ.get("PDF_JOB_MAX_ATTEMPTS", "3"))
+PDF_JOB_TIMEOUT = int(os.environ.get("PDF_JOB_TIMEOUT", "300"))
+# Admission control: concurrent requests per pool across the host ("file")
+# or per worker ("process", only useful with threaded workers); requests
+# over the limit get 503 + Retry-After
+ADMISSION_BACKEND = os.environ.get("ADMISSION_BACKEND", "file")
+ADMISSION_LOCK_DIR = os.environ.get("ADMISSION_LOCK_DIR", str(BASE_DIR / ".cache" / "admission"))
+ADMISSION_LIMITS = {
+    "pdf": int(os.environ.get("ADMISSION_PDF_LIMIT", "2")),
+    "pdf-pack": int(os.environ.get("ADMISSION_PDF_PACK_LIMIT", "1")),
+}
+ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER", "5"))
+# Request coalescing: seconds a follower waits on the leader, and whether
+# workers also coordinate PDF renders through the RenderLock table
+SINGLE_FLIGHT_WAIT = float(os.environ.get("SINGLE_FLIGHT_WAIT", "30"))
+PDF_RENDER_LOCKS = os.environ.get("PDF_RENDER_LOCKS", "false").lower() == "true"
+PDF_RENDER_LOCK_TTL = int(os.environ.get("PDF_RENDER_LOCK_TTL", "60"))
 
 # Database
 DATABASES = {
@@ -96,6 +182,18 @@ DATABASES = {
     }
 }
 
+# Shared cache. Cached values such as department summaries are
+# invalidated on writes, which only works if every worker reads the same
+# store; the default keeps it in MySQL (run `manage.py createcachetable`).
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "django_cache"),
+    }
+}
+
 # AWS / S3
 AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID", "")
 AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY", "")
@@ -108,6 +206,17 @@ AWS_QUERYSTRING_AUTH = False
 
 DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
 MEDIA_URL = f"https://{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazonaws.com/"
+# Latency-bound S3 reads (PDF images): per-attempt timeouts, overall budget,
+# retries within it, and the circuit breaker that skips S3 while it is failing.
+# Keep connect + read timeout below the budget: a retry only starts when
+# both still fit, and a stalled body read may overrun by one read timeout
+S3_READ_CONNECT_TIMEOUT = float(os.environ.get("S3_READ_CONNECT_TIMEOUT", "0.5"))
+S3_READ_TIMEOUT = float(os.environ.get("S3_READ_TIMEOUT", "1"))
+S3_READ_BUDGET = float(os.environ.get("S3_READ_BUDGET", "2.5"))
+S3_READ_RETRIES = int(os.environ.get("S3_READ_RETRIES", "1"))
+S3_READ_MAX_BYTES = int(os.environ.get("S3_READ_MAX_BYTES", str(20 * 1024 * 1024)))
+S3_BREAKER_THRESHOLD = int(os.environ.get("S3_BREAKER_THRESHOLD", "5"))
+S3_BREAKER_COOLDOWN = float(os.environ.get("S3_BREAKER_COOLDOWN", "30"))
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
@@ -0,0 +1,15 @@
+from .base import *
+
+# Lets `manage.py test` run without a MySQL server:
+# DJANGO_SETTINGS_MODULE=admin_hub.settings.test python manage.py test
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+SECRET_KEY = SECRET_KEY or "test-secret-key"
+
+AUDIT_LOG_MODE = "sync"
+ISSUE_SEARCH_BACKEND = "memory"
@@ -0,0 +1,55 @@
+"""
+In-process request coalescing.
+
+Concurrent calls sharing a key run the computation once: the first
+caller (the leader) does the work, the others wait for and share its
+result. Nothing is cached once the call finishes.
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, wait_timeout=30):
+        self.wait_timeout = wait_timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Returns fn(), sharing one execution between concurrent callers.
+
+        A follower that waits longer than `wait_timeout` gives up and
+        runs fn() itself, so a stuck leader can't hold everyone up.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
@@ -0,0 +1,153 @@
+import tempfile
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from . import admission
+from .admission import AdmissionControlMixin, get_pool
+from .singleflight import SingleFlight
+
+
+class LimitedView(AdmissionControlMixin, APIView):
+    authentication_classes = []
+    permission_classes = []
+    admission_pool = "test"
+
+    def get(self, request):
+        return Response({"ok": True})
+
+
+class AdmissionControlTests(SimpleTestCase):
+    def setUp(self):
+        lock_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(lock_dir.cleanup)
+        limits = override_settings(
+            ADMISSION_LIMITS={"test": 1},
+            ADMISSION_LOCK_DIR=lock_dir.name,
+            ADMISSION_RETRY_AFTER=7,
+        )
+        limits.enable()
+        self.addCleanup(limits.disable)
+        admission._pools.clear()
+        self.addCleanup(admission._pools.clear)
+
+    def get(self):
+        return LimitedView.as_view()(APIRequestFactory().get("/"))
+
+    def test_default_backend_is_shared_across_workers(self):
+        self.assertIsInstance(get_pool("test"), admission.FileSlots)
+
+    def test_request_over_limit_is_rejected_until_slot_frees(self):
+        for backend in ["file", "process"]:
+            with self.subTest(backend=backend), override_settings(
+                ADMISSION_BACKEND=backend
+            ):
+                admission._pools.clear()
+                pool = get_pool("test")
+
+                held = pool.acquire()
+                response = self.get()
+                self.assertEqual(response.status_code, 503)
+                self.assertEqual(response["Retry-After"], "7")
+
+                pool.release(held)
+                self.assertEqual(self.get().status_code, 200)
+
+                # The admitted request gave its slot back
+                token = pool.acquire()
+                self.assertIsNotNone(token)
+                pool.release(token)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def run_concurrently(self, flight, fn, callers=5):
+        """
+        Starts one leader blocked inside `fn`, then `callers - 1`
+        followers, and lets the leader finish once they are waiting.
+        Returns each caller's (result, error).
+        """
+        started, release = threading.Event(), threading.Event()
+        outcomes = []
+        outcomes_lock = threading.Lock()
+
+        def leader_fn():
+            started.set()
+            release.wait(5)
+            return fn()
+
+        def call(target):
+            try:
+                outcome = (flight.do("key", target), None)
+            except Exception as e:
+                outcome = (None, e)
+            with outcomes_lock:
+                outcomes.append(outcome)
+
+        threads = [threading.Thread(target=call, args=(leader_fn,))]
+        threads[0].start()
+        started.wait(5)
+        for _ in range(callers - 1):
+            thread = threading.Thread(target=call, args=(fn,))
+            thread.start()
+            threads.append(thread)
+
+        time.sleep(0.1)  # let the followers reach their wait
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        return outcomes
+
+    def test_concurrent_calls_share_one_result(self):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            return object()
+
+        outcomes = self.run_concurrently(SingleFlight(), fn)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(outcomes), 5)
+        self.assertEqual(len({id(result) for result, _ in outcomes}), 1)
+
+    def test_concurrent_calls_share_one_exception(self):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            raise ValueError("render failed")
+
+        outcomes = self.run_concurrently(SingleFlight(), fn)
+
+        self.assertEqual(len(calls), 1)
+        errors = {id(error) for _, error in outcomes}
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(outcomes[0][1], ValueError)
+
+    def test_follower_runs_fn_itself_after_timeout(self):
+        flight = SingleFlight(wait_timeout=0.05)
+        started, release = threading.Event(), threading.Event()
+
+        def stuck():
+            started.set()
+            release.wait(5)
+            return "leader"
+
+        leader = threading.Thread(target=flight.do, args=("key", stuck))
+        leader.start()
+        started.wait(5)
+        try:
+            self.assertEqual(flight.do("key", lambda: "follower"), "follower")
+        finally:
+            release.set()
+            leader.join(5)
+
+    def test_nothing_is_kept_after_the_call(self):
+        flight = SingleFlight()
+        flight.do("key", lambda: 1)
+
+        self.assertEqual(flight.do("key", lambda: 2), 2)
@@ -0,0 +1,18 @@
+"""
+Entry points for child processes that run Django code.
+
+Pool initializers are pickled by reference, so they live here, away from
+any module that defines models: importing one of those in a fresh child
+before django.setup() fails.
+"""
+
+import django
+
+
+def init_django_worker():
+    django.setup()
+
+    from admin_hub import s3
+
+    # Never share the parent's pooled S3 connections
+    s3.reset_clients()
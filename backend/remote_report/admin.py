@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import IssueReportRemote
+from .models import IssueReportRemote, PDFRenderJob
 
 @admin.register(IssueReportRemote)
 class IssueReportRemoteAdmin(admin.ModelAdmin):
@@ -7,3 +7,12 @@ class IssueReportRemoteAdmin(admin.ModelAdmin):
     search_fields = ("tracking_id", "issue_title", "location", "department")
     readonly_fields = [f.name for f in IssueReportRemote._meta.fields]
     list_per_page = 25
+
+
+@admin.register(PDFRenderJob)
+class PDFRenderJobAdmin(admin.ModelAdmin):
+    list_display = ("job_id", "requested_by", "department", "format", "status", "attempts", "created_at", "finished_at")
+    list_filter = ("status", "format")
+    search_fields = ("job_id", "requested_by", "department")
+    readonly_fields = [f.name for f in PDFRenderJob._meta.fields]
+    list_per_page = 25
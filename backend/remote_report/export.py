@@ -0,0 +1,134 @@
+"""
+Exports of issue rows as CSV, NDJSON or Parquet.
+
+Rows are read in id-ordered chunks of `chunk_size`, one query per chunk,
+so the export streams without loading the table into memory.
+"""
+
+import csv
+from itertools import islice
+from operator import itemgetter
+
+from django.utils import timezone
+
+from admin_hub.pagination import iter_by_id
+
+from .fastjson import DATETIME_FIELDS, dumps, format_datetime
+from .serializers import IssueReportSerializer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - Parquet export needs pyarrow
+    pa = None
+    pq = None
+
+EXPORT_FIELDS = list(IssueReportSerializer.Meta.fields)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# Streamed responses are flushed in pieces of about this size
+FLUSH_BYTES = 64 * 1024
+
+
+def export_rows(queryset, chunk_size=2000):
+    return iter_by_id(
+        queryset.values_list(*EXPORT_FIELDS),
+        chunk_size,
+        itemgetter(EXPORT_FIELDS.index("id")),
+    )
+
+
+def _text_rows(rows):
+    datetime_positions = [
+        n for n, f in enumerate(EXPORT_FIELDS) if f in DATETIME_FIELDS
+    ]
+    tz = timezone.get_current_timezone()
+    for row in rows:
+        row = list(row)
+        for n in datetime_positions:
+            row[n] = format_datetime(row[n], tz)
+        yield row
+
+
+def _flushed(pieces):
+    """
+    Groups small str/bytes pieces into chunks of roughly FLUSH_BYTES.
+    """
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= FLUSH_BYTES:
+            yield buffer[0][:0].join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield buffer[0][:0].join(buffer)
+
+
+class _Echo:
+    """
+    File-like object whose write() hands the line back to csv.writer's
+    caller instead of storing it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in _text_rows(rows):
+            yield writer.writerow(row)
+
+    return _flushed(lines())
+
+
+def iter_ndjson(rows):
+    def lines():
+        for row in _text_rows(rows):
+            yield dumps(dict(zip(EXPORT_FIELDS, row))) + b"\n"
+
+    return _flushed(lines())
+
+
+def parquet_schema():
+    timestamp = pa.timestamp("us", tz="UTC")
+    types = {
+        "id": pa.int64(),
+        "confidence_score": pa.int64(),
+        "issue_date": timestamp,
+        "updated_at": timestamp,
+    }
+    return pa.schema([(f, types.get(f, pa.string())) for f in EXPORT_FIELDS])
+
+
+def write_parquet(rows, sink, batch_size=10000):
+    """
+    Writes rows to `sink` one row group per batch, so at most one batch
+    is materialised at a time.
+    """
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    schema = parquet_schema()
+    rows = iter(rows)
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            columns = zip(*batch)
+            arrays = [
+                pa.array(column, type=field.type)
+                for column, field in zip(columns, schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
@@ -0,0 +1,92 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from remote_report.fastjson import IssueRowEncoder
+from remote_report.models import IssueReportRemote
+from remote_report.serializers import IssueReportSerializer
+
+
+def make_rows(count, columns):
+    """
+    Builds synthetic issues in memory, so the benchmark needs no database.
+    """
+    now = timezone.now()
+    instances = []
+    for i in range(count):
+        instances.append(
+            IssueReportRemote(
+                id=i + 1,
+                tracking_id=f"RM{i:08d}",
+                issue_title=f"Streetlight not working near block {i}",
+                location="Market Road, Ward 12",
+                issue_description="Reported by a citizen. " * 10,
+                issue_date=now - timedelta(minutes=i),
+                updated_at=now - timedelta(seconds=i),
+                status="pending",
+                department="Electrical",
+                allocated_to=None,
+                confidence_score=87,
+                image_url=f"reports/{i}/photo.jpg",
+                completion_url=None,
+                user_id=i,
+            )
+        )
+    tuples = [tuple(getattr(obj, c) for c in columns) for obj in instances]
+    return instances, tuples
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = "Compares IssueReportSerializer against the fast JSON path"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,100000",
+            help="Comma-separated row counts",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        fields = IssueReportSerializer.Meta.fields
+        encoder = IssueRowEncoder(fields)
+        renderer = JSONRenderer()
+
+        sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+
+        self.stdout.write(
+            f"{'rows':>8}  {'serializer':>12}  {'fast path':>12}  {'speedup':>8}"
+        )
+        for size in sizes:
+            instances, tuples = make_rows(size, encoder.columns)
+
+            slow = renderer.render(IssueReportSerializer(instances, many=True).data)
+            fast = encoder.encode(tuples)
+            if slow != fast:
+                self.stderr.write(f"Output mismatch at {size} rows")
+
+            slow_t = timed(
+                lambda: renderer.render(
+                    IssueReportSerializer(instances, many=True).data
+                ),
+                options["repeat"],
+            )
+            fast_t = timed(lambda: encoder.encode(tuples), options["repeat"])
+
+            self.stdout.write(
+                f"{size:>8}  {slow_t * 1000:>10.1f}ms  {fast_t * 1000:>10.1f}ms"
+                f"  {slow_t / fast_t:>7.1f}x"
+            )
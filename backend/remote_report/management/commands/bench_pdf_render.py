@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from remote_report.models import IssueReportRemote
+from remote_report.pdf import BriefingTemplate, get_briefing_template
+
+
+def sample_issue():
+    now = timezone.now()
+    return IssueReportRemote(
+        id=1,
+        tracking_id="RM00000001",
+        issue_title="Streetlight not working near market road",
+        location="Market Road, Ward 12",
+        issue_description="Reported by a citizen.\n" * 8,
+        issue_date=now,
+        updated_at=now,
+        status="in_progress",
+        department="Electrical",
+        user_id=1,
+        # No image, so the benchmark measures layout work, not S3
+        image_url=None,
+    )
+
+
+class Command(BaseCommand):
+    help = "Measures briefing PDF renders per second with and without the shared template"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        issue = sample_issue()
+        iterations = options["iterations"]
+
+        # Before: styles, table styles and logo rebuilt for every render
+        start = time.perf_counter()
+        for _ in range(iterations):
+            BriefingTemplate().render(issue)
+        cold = iterations / (time.perf_counter() - start)
+
+        # After: one template per process
+        template = get_briefing_template()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            template.render(issue)
+        warm = iterations / (time.perf_counter() - start)
+
+        self.stdout.write(f"per-render template: {cold:8.1f} renders/s")
+        self.stdout.write(f"shared template:     {warm:8.1f} renders/s")
+        self.stdout.write(f"speedup:             {warm / cold:8.2f}x")
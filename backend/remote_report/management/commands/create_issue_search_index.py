@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from remote_report.models import IssueReportRemote
+from remote_report.search import (
+    FULLTEXT_INDEX_NAME,
+    SEARCH_FIELDS,
+    fulltext_available,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds the FULLTEXT index used by issue search to the report table. "
+        "The table is owned by the citizen app, so Django doesn't migrate it."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "mysql":
+            raise CommandError(
+                "FULLTEXT search needs MySQL; other databases use the "
+                "in-process index"
+            )
+
+        if fulltext_available():
+            self.stdout.write("Search index already exists")
+            return
+
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(f) for f in SEARCH_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {quote(IssueReportRemote._meta.db_table)} "
+                f"ADD FULLTEXT INDEX {quote(FULLTEXT_INDEX_NAME)} ({columns})"
+            )
+        self.stdout.write(self.style.SUCCESS("Created search index"))
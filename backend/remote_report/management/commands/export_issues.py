@@ -0,0 +1,69 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from remote_report.export import (
+    EXPORT_FORMATS,
+    export_rows,
+    iter_csv,
+    iter_ndjson,
+    write_parquet,
+)
+from remote_report.models import IssueReportRemote
+
+
+class Command(BaseCommand):
+    help = "Streams issue rows to a CSV, NDJSON or Parquet file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Output path, '-' for stdout (csv/ndjson only)",
+        )
+        parser.add_argument("--department", help="Limit to one department")
+        parser.add_argument("--status", help="Limit to one status")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=getattr(settings, "ISSUE_EXPORT_CHUNK_SIZE", 2000),
+        )
+
+    def handle(self, *args, **options):
+        fmt = options["format"]
+        output = options["output"]
+
+        issues = IssueReportRemote.objects.all()
+        if options["department"]:
+            issues = issues.filter(department=options["department"])
+        if options["status"]:
+            issues = issues.filter(status=options["status"])
+
+        rows = export_rows(issues, chunk_size=options["chunk_size"])
+
+        if fmt == "parquet":
+            if output == "-":
+                raise CommandError("Parquet output needs --output")
+            try:
+                write_parquet(rows, output)
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            return
+
+        chunks = iter_csv(rows) if fmt == "csv" else iter_ndjson(rows)
+
+        if output == "-":
+            for chunk in chunks:
+                if isinstance(chunk, bytes):
+                    sys.stdout.buffer.write(chunk)
+                else:
+                    sys.stdout.write(chunk)
+            return
+
+        mode = "w" if fmt == "csv" else "wb"
+        kwargs = {"newline": "", "encoding": "utf-8"} if fmt == "csv" else {}
+        with open(output, mode, **kwargs) as f:
+            for chunk in chunks:
+                f.write(chunk)
@@ -0,0 +1,60 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from remote_report.pdf_jobs import work
+
+
+def _worker(poll_interval, once):
+    stop = {"requested": False}
+
+    def handle_term(signum, frame):
+        stop["requested"] = True
+
+    signal.signal(signal.SIGTERM, handle_term)
+    signal.signal(signal.SIGINT, handle_term)
+    work(poll_interval, once, should_stop=lambda: stop["requested"])
+
+
+class Command(BaseCommand):
+    help = "Runs PDF render workers that pull jobs from the PDFRenderJob table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        poll_interval = options["poll_interval"]
+        once = options["once"]
+
+        if workers == 1:
+            _worker(poll_interval, once)
+            return
+
+        # Children must open their own database connections
+        connections.close_all()
+
+        processes = [
+            multiprocessing.Process(target=_worker, args=(poll_interval, once))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {workers} PDF workers")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
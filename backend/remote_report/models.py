@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 
 class IssueReportRemote(models.Model):
@@ -22,3 +24,45 @@ class IssueReportRemote(models.Model):
 
     def __str__(self):
         return f"{self.tracking_id or self.id} — {self.issue_title[:40]}"
+
+
+class PDFRenderJob(models.Model):
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    requested_by = models.CharField(max_length=6)
+    department = models.CharField(max_length=255)
+    tracking_ids = models.JSONField()
+    format = models.CharField(max_length=10, default="pdf")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    result = models.FileField(upload_to="pdf-jobs/", blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.job_id} ({self.status})"
+
+
+class RenderLock(models.Model):
+    """
+    Cross-worker lock row: whoever inserts it renders, the others wait
+    for the result to show up in the shared PDF cache.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,11 @@
+from admin_hub.pagination import KeysetPagination
+
+
+class IssueKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination of issue lists over (-issue_date, -id).
+    """
+
+    date_field = "issue_date"
+    page_size_setting = "ISSUE_PAGE_SIZE"
+    max_page_size_setting = "ISSUE_MAX_PAGE_SIZE"
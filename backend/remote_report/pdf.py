@@ -0,0 +1,406 @@
+import os
+import threading
+from collections import namedtuple
+from io import BytesIO
+
+from reportlab.graphics.barcode import qr
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib import colors
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import (
+    SimpleDocTemplate,
+    Paragraph,
+    Spacer,
+    Image,
+    Table,
+    TableStyle,
+)
+
+from .pdf_images import prepare_issue_image
+
+# Bump whenever the briefing layout changes so cached PDFs are re-rendered
+PDF_TEMPLATE_VERSION = "2"
+
+ASSETS_PATH = os.path.join(os.path.dirname(__file__), "..", "assets")
+
+STATUS_COLORS = {
+    "pending": ("#FEF3C7", "#92400E"),
+    "in_progress": ("#DBEAFE", "#1E40AF"),
+    "escalated": ("#FEE2E2", "#991B1B"),
+    "resolved": ("#D1FAE5", "#065F46"),
+}
+DEFAULT_STATUS_COLORS = ("#F3F4F6", "#1F2937")
+
+# A rendered briefing. `complete` is False when the photo was replaced by
+# the "Image unavailable" box; such PDFs must not be cached, or a single
+# S3 hiccup would stick to the issue until it is next edited.
+Briefing = namedtuple("Briefing", ["pdf", "complete"])
+
+
+class BriefingTemplate:
+    """
+    Everything in the briefing layout that doesn't depend on the issue:
+    paragraph styles, table styles and the decoded header logo.
+
+    Built once per process (see get_briefing_template) and shared by all
+    renders; none of it is mutated while a document is built.
+    """
+
+    def __init__(self):
+        self.section_header = ParagraphStyle(
+            "SectionHeader",
+            fontSize=13,
+            fontName="Helvetica-Bold",
+            textColor=colors.black,
+            spaceBefore=18,
+            spaceAfter=10,
+            leftIndent=0,
+        )
+        self.body_text = ParagraphStyle(
+            "BodyText",
+            fontSize=10,
+            leading=14,
+            textColor=HexColor("#374151"),
+        )
+        self.subtitle = ParagraphStyle(
+            "Subtitle",
+            fontSize=9,
+            textColor=HexColor("#6B7280"),
+            spaceAfter=16,
+            leading=13,
+        )
+        self.qr_caption = ParagraphStyle(
+            "QRCaption",
+            fontSize=9,
+            textColor=HexColor("#6B7280"),
+            alignment=1,
+        )
+        self.auth = ParagraphStyle(
+            "Auth",
+            fontSize=9,
+            textColor=HexColor("#374151"),
+            leading=12,
+        )
+
+        self.overview_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), HexColor("#F9FAFB")),
+                ("GRID", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 12),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
+                ("TOPPADDING", (0, 0), (-1, -1), 8),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+            ]
+        )
+        self.text_box_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), HexColor("#F9FAFB")),
+                ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
+                ("LEFTPADDING", (0, 0), (-1, -1), 12),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
+                ("TOPPADDING", (0, 0), (-1, -1), 10),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+            ]
+        )
+        self.image_box_style = TableStyle(
+            [
+                ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 10),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 10),
+                ("TOPPADDING", (0, 0), (-1, -1), 10),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+                ("BACKGROUND", (0, 0), (-1, -1), colors.white),
+            ]
+        )
+        self.notice_box_style = TableStyle(
+            [
+                ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 12),
+                ("TOPPADDING", (0, 0), (-1, -1), 20),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 20),
+            ]
+        )
+        self.allocation_style = TableStyle(
+            [
+                ("BOX", (0, 0), (-1, -1), 1, colors.black),
+                ("INNERGRID", (0, 0), (-1, -1), 0.5, HexColor("#D1D5DB")),
+                ("LEFTPADDING", (0, 0), (-1, -1), 8),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+            ]
+        )
+        self.qr_box_style = TableStyle(
+            [
+                ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("TOPPADDING", (0, 0), (-1, -1), 15),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 15),
+            ]
+        )
+        self.auth_box_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), HexColor("#F3F4F6")),
+                ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#D1D5DB")),
+                ("LEFTPADDING", (0, 0), (-1, -1), 12),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
+                ("TOPPADDING", (0, 0), (-1, -1), 10),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+            ]
+        )
+
+        try:
+            self.logo = ImageReader(os.path.join(ASSETS_PATH, "logo-1.png"))
+            # Decode now rather than on the first page drawn
+            self.logo.getRGBData()
+        except Exception:
+            self.logo = None
+
+    def draw_header_footer(self, canvas, doc):
+        canvas.saveState()
+
+        PAGE_WIDTH, PAGE_HEIGHT = A4
+        HEADER_HEIGHT = 70
+        header_y = PAGE_HEIGHT - HEADER_HEIGHT
+
+        #Header Bg
+        canvas.setFillColor(colors.black)
+        canvas.rect(0, header_y, PAGE_WIDTH, HEADER_HEIGHT, stroke=0, fill=1)
+
+        #Logo
+        if self.logo is not None:
+            try:
+                canvas.drawImage(
+                    self.logo,
+                    40,
+                    header_y + 20,
+                    width=35,
+                    height=35,
+                    preserveAspectRatio=True,
+                    mask="auto",
+                )
+            except Exception:
+                pass
+
+        canvas.setFillColor(colors.white)
+        canvas.setFont("Helvetica-Bold", 18)
+        canvas.drawString(85, header_y + 38, "ReportMitra")
+
+        canvas.setFont("Helvetica", 9)
+        canvas.setFillColor(HexColor("#D1D5DB"))
+        canvas.drawString(85, header_y + 22, "CIVIC | CONNECT | RESOLVE")
+
+        #DocTitle
+        canvas.setFillColor(colors.white)
+        canvas.setFont("Helvetica-Bold", 12)
+        text = "Issue Field Briefing Report"
+        text_width = canvas.stringWidth(text, "Helvetica-Bold", 12)
+        canvas.drawString(PAGE_WIDTH - text_width - 40, header_y + 32, text)
+
+        #Footer
+        canvas.setFillColor(HexColor("#6B7280"))
+        canvas.setFont("Helvetica", 8)
+        canvas.drawString(40, 35, f"Page {doc.page}")
+
+        footer_text = "Generated from ReportMitra Admin Portal"
+        footer_width = canvas.stringWidth(footer_text, "Helvetica", 8)
+        canvas.drawString(PAGE_WIDTH - footer_width - 40, 35, footer_text)
+
+        canvas.restoreState()
+
+    def boxed(self, content, style, **kwargs):
+        box = Table([[content]], colWidths=[485], **kwargs)
+        box.setStyle(style)
+        return box
+
+    def render(self, issue):
+        """
+        Renders the field briefing PDF for an issue. Returns a Briefing
+        whose `complete` is False when the photo couldn't be loaded and
+        the "Image unavailable" box was drawn instead.
+        """
+        complete = True
+        body_text = self.body_text
+        section_header = self.section_header
+
+        buffer = BytesIO()
+
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=40,
+            leftMargin=40,
+            topMargin=90,
+            bottomMargin=65,
+        )
+
+        story = []
+
+        story.append(
+            Paragraph(
+                "This document assists on-site municipal workers with issue verification, "
+                "safety assessment, and resolution procedures.",
+                self.subtitle,
+            )
+        )
+
+        bg_color, text_color = STATUS_COLORS.get(issue.status, DEFAULT_STATUS_COLORS)
+
+        story.append(Paragraph("Issue Overview", section_header))
+
+        overview_data = [
+            [
+                Paragraph("<b>Tracking ID</b>", body_text),
+                Paragraph(issue.tracking_id, body_text),
+            ],
+            [
+                Paragraph("<b>Status</b>", body_text),
+                Paragraph(
+                    f'<para backColor="{bg_color}" textColor="{text_color}" '
+                    f'fontSize="9" fontName="Helvetica-Bold">'
+                    f'&nbsp;&nbsp;{issue.status.upper()}&nbsp;&nbsp;</para>',
+                    body_text,
+                ),
+            ],
+            [
+                Paragraph("<b>Department</b>", body_text),
+                Paragraph(issue.department, body_text),
+            ],
+            [
+                Paragraph("<b>Location</b>", body_text),
+                Paragraph(issue.location, body_text),
+            ],
+            [
+                Paragraph("<b>Reported On</b>", body_text),
+                Paragraph(
+                    issue.issue_date.strftime("%d %B %Y, %I:%M %p"), body_text
+                ),
+            ],
+        ]
+
+        overview_table = Table(overview_data, colWidths=[130, 355])
+        overview_table.setStyle(self.overview_style)
+        story.append(overview_table)
+        story.append(Spacer(1, 16))
+
+        story.append(Paragraph("Issue Title", section_header))
+        story.append(
+            self.boxed(Paragraph(issue.issue_title, body_text), self.text_box_style)
+        )
+
+        story.append(Paragraph("Issue Description", section_header))
+        story.append(
+            self.boxed(
+                Paragraph(issue.issue_description.replace("\n", "<br/>"), body_text),
+                self.text_box_style,
+            )
+        )
+
+        story.append(Paragraph("Issue Image (On-site Reference)", section_header))
+
+        if issue.image_url:
+            try:
+                img = Image(
+                    BytesIO(prepare_issue_image(issue)),
+                    width=4.5 * inch,
+                    height=3 * inch,
+                    kind="proportional",
+                )
+                story.append(self.boxed(img, self.image_box_style))
+            except Exception:
+                complete = False
+                story.append(
+                    self.boxed(
+                        Paragraph("Image unavailable", body_text),
+                        self.notice_box_style,
+                    )
+                )
+        else:
+            story.append(
+                self.boxed(
+                    Paragraph("No image attached", body_text),
+                    self.notice_box_style,
+                )
+            )
+
+        story.append(Paragraph("Allocated To (Fill On-Site)", section_header))
+
+        allocation_box = Table(
+            [[""], [""], [""]],
+            colWidths=[485],
+            rowHeights=[25, 25, 25],
+        )
+        allocation_box.setStyle(self.allocation_style)
+        story.append(allocation_box)
+
+        #QR Code
+        story.append(Paragraph("Quick Access QR Code", section_header))
+
+        qr_url = f"https://reportmitra.in/admin/issues/{issue.tracking_id}"
+        qr_code = qr.QrCodeWidget(qr_url)
+        bounds = qr_code.getBounds()
+        width = bounds[2] - bounds[0]
+        height = bounds[3] - bounds[1]
+        d = Drawing(100, 100, transform=[100.0 / width, 0, 0, 100.0 / height, 0, 0])
+        d.add(qr_code)
+
+        story.append(self.boxed(d, self.qr_box_style))
+
+        story.append(Spacer(1, 8))
+        story.append(
+            Paragraph(
+                "<i>Scan to view issue details on ReportMitra Admin Portal</i>",
+                self.qr_caption,
+            )
+        )
+
+        #Document Authenticity
+        story.append(Spacer(1, 25))
+        story.append(
+            self.boxed(
+                Paragraph(
+                    "<b>Official Document</b><br/>"
+                    "This is an official municipal record generated digitally "
+                    "by ReportMitra Admin Portal.",
+                    self.auth,
+                ),
+                self.auth_box_style,
+            )
+        )
+
+        #Build PDF
+        doc.build(
+            story,
+            onFirstPage=self.draw_header_footer,
+            onLaterPages=self.draw_header_footer,
+        )
+
+        return Briefing(buffer.getvalue(), complete)
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def get_briefing_template():
+    global _template
+
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = BriefingTemplate()
+    return _template
+
+
+def render_issue_pdf(issue):
+    """
+    Renders the field briefing PDF for an issue and returns a Briefing.
+    """
+    return get_briefing_template().render(issue)
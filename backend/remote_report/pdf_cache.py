@@ -0,0 +1,203 @@
+"""
+Content-addressed cache for rendered issue briefing PDFs.
+
+A briefing only changes when its issue's updated_at (or the layout)
+changes, so the cache key is derived from
+(tracking_id, updated_at, PDF_TEMPLATE_VERSION) and entries never need
+invalidating; stale ones simply stop being looked up and age out.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from admin_hub.singleflight import SingleFlight
+
+from .blob_cache import DiskBlobCache
+from .models import RenderLock
+from .pdf import PDF_TEMPLATE_VERSION, render_issue_pdf
+from .storage import get_s3_client
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_cache_key(tracking_id, updated_at):
+    raw = f"{tracking_id}|{updated_at.isoformat()}|{PDF_TEMPLATE_VERSION}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class DiskPDFCache(DiskBlobCache):
+    suffix = ".pdf"
+
+
+class S3PDFCache:
+    """
+    Object-storage backend. Eviction is left to a bucket lifecycle rule
+    on the prefix.
+    """
+
+    def __init__(self, bucket, prefix):
+        self.bucket = bucket
+        self.prefix = prefix.rstrip("/")
+
+    def _object_key(self, key):
+        return f"{self.prefix}/{key}.pdf"
+
+    def get(self, key):
+        client = get_s3_client()
+        try:
+            obj = client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        except client.exceptions.NoSuchKey:
+            return None
+        return obj["Body"].read()
+
+    def set(self, key, data):
+        get_s3_client().put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=data,
+            ContentType="application/pdf",
+        )
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_pdf_cache():
+    """
+    Returns the configured backend, or None when caching is disabled.
+    """
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _build_backend()
+    return _backend or None
+
+
+def _build_backend():
+    kind = getattr(settings, "PDF_CACHE_BACKEND", "disk")
+
+    if kind == "disk":
+        return DiskPDFCache(
+            settings.PDF_CACHE_DIR,
+            getattr(settings, "PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024),
+        )
+    if kind == "s3":
+        return S3PDFCache(
+            getattr(settings, "PDF_CACHE_BUCKET", None)
+            or settings.AWS_STORAGE_BUCKET_NAME,
+            getattr(settings, "PDF_CACHE_PREFIX", "pdf-cache"),
+        )
+    # Disabled; False keeps get_pdf_cache() from rebuilding every call
+    return False
+
+
+pdf_flights = SingleFlight(wait_timeout=getattr(settings, "SINGLE_FLIGHT_WAIT", 30))
+
+
+def acquire_render_lock(key):
+    now = timezone.now()
+    ttl = getattr(settings, "PDF_RENDER_LOCK_TTL", 60)
+
+    # Locks left behind by a crashed worker expire
+    RenderLock.objects.filter(key=key, expires_at__lt=now).delete()
+    try:
+        with transaction.atomic():
+            RenderLock.objects.create(key=key, expires_at=now + timedelta(seconds=ttl))
+    except IntegrityError:
+        return False
+    return True
+
+
+def release_render_lock(key):
+    RenderLock.objects.filter(key=key).delete()
+
+
+def wait_for_other_worker(cache, key):
+    """
+    Polls the shared cache while another worker holds the render lock.
+    Returns the PDF, or None if the lock went away without one.
+    """
+    deadline = time.monotonic() + getattr(settings, "SINGLE_FLIGHT_WAIT", 30)
+    while time.monotonic() < deadline:
+        time.sleep(0.2)
+        pdf = cache.get(key)
+        if pdf is not None:
+            return pdf
+        if not RenderLock.objects.filter(key=key).exists():
+            return cache.get(key)
+    return None
+
+
+def _read_cache(cache, key, issue):
+    try:
+        return cache.get(key)
+    except Exception:
+        logger.exception("PDF cache read failed for %s", issue.tracking_id)
+        return None
+
+
+def store_briefing(cache, key, issue, briefing):
+    """
+    Caches a complete briefing. One rendered without its photo is left
+    out, so the next request retries the image.
+    """
+    if cache is None or not briefing.complete:
+        return
+    try:
+        cache.set(key, briefing.pdf)
+    except Exception:
+        logger.exception("PDF cache write failed for %s", issue.tracking_id)
+
+
+def _render_and_store(cache, key, issue):
+    briefing = render_issue_pdf(issue)
+    store_briefing(cache, key, issue, briefing)
+    return briefing.pdf
+
+
+def _get_or_render(cache, key, issue):
+    pdf = _read_cache(cache, key, issue)
+    if pdf is not None:
+        return pdf
+
+    if not getattr(settings, "PDF_RENDER_LOCKS", False):
+        return _render_and_store(cache, key, issue)
+
+    # Cross-worker single flight through the RenderLock table
+    if acquire_render_lock(key):
+        try:
+            return _render_and_store(cache, key, issue)
+        finally:
+            release_render_lock(key)
+
+    pdf = wait_for_other_worker(cache, key)
+    if pdf is not None:
+        return pdf
+    return _render_and_store(cache, key, issue)
+
+
+def get_cached_issue_pdf(issue):
+    """
+    Returns the issue's briefing PDF, rendering and storing it on a miss.
+
+    Concurrent requests for the same (tracking_id, updated_at) in this
+    process share one render. With PDF_RENDER_LOCKS enabled, workers
+    also coordinate through the RenderLock table so only one of them
+    renders. Cache errors are logged and never fail the download.
+    """
+    cache = get_pdf_cache()
+    key = pdf_cache_key(issue.tracking_id, issue.updated_at)
+
+    if cache is None:
+        return pdf_flights.do(key, lambda: render_issue_pdf(issue).pdf)
+    return pdf_flights.do(key, lambda: _get_or_render(cache, key, issue))
@@ -0,0 +1,114 @@
+"""
+Preprocessing of citizen photos before they are embedded in briefings.
+
+Phone photos are often several megabytes but only ever shown in a
+4.5 x 3 inch box, so they are decoded, EXIF-oriented, downsampled to the
+target DPI and recompressed as JPEG once, then cached by S3 key.
+"""
+
+import hashlib
+import logging
+import threading
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+from .blob_cache import DiskBlobCache
+from .storage import extract_s3_key, read_object
+
+logger = logging.getLogger(__name__)
+
+# Size of the image box in the briefing layout, in inches
+IMAGE_BOX_INCHES = (4.5, 3)
+
+
+def load_issue_image(issue):
+    """
+    Returns the raw bytes of the issue's photo from S3.
+
+    Raises StorageUnavailable when S3 is slow or failing, which the
+    layout turns into the "Image unavailable" box.
+    """
+    return read_object(issue.image_url)
+
+
+def preprocess_image(data, max_size, quality):
+    """
+    Decodes `data`, applies its EXIF orientation, fits it inside
+    `max_size` pixels and returns it re-encoded as JPEG.
+    """
+    with PILImage.open(BytesIO(data)) as im:
+        # Let the JPEG decoder downscale by a power of two while decoding.
+        # The box is squared because EXIF rotation may swap the axes.
+        side = max(max_size)
+        im.draft("RGB", (side, side))
+
+        im = ImageOps.exif_transpose(im)
+
+        if im.mode in ("RGBA", "LA", "P"):
+            im = im.convert("RGBA")
+            background = PILImage.new("RGB", im.size, "white")
+            background.paste(im, mask=im.getchannel("A"))
+            im = background
+        elif im.mode != "RGB":
+            im = im.convert("RGB")
+
+        im.thumbnail(max_size, PILImage.LANCZOS)
+
+        out = BytesIO()
+        im.save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+        return out.getvalue()
+
+
+class DiskImageCache(DiskBlobCache):
+    suffix = ".jpg"
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache():
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DiskImageCache(
+                    settings.PDF_IMAGE_CACHE_DIR,
+                    getattr(settings, "PDF_IMAGE_CACHE_MAX_BYTES", 128 * 1024 * 1024),
+                )
+    return _cache
+
+
+def prepare_issue_image(issue):
+    """
+    Returns the issue's photo ready for embedding, from cache when possible.
+
+    Upload keys are never overwritten, so the S3 key plus the processing
+    parameters fully identify the result.
+    """
+    dpi = getattr(settings, "PDF_IMAGE_DPI", 150)
+    quality = getattr(settings, "PDF_IMAGE_QUALITY", 80)
+    max_size = tuple(int(inches * dpi) for inches in IMAGE_BOX_INCHES)
+
+    raw_key = f"{extract_s3_key(issue.image_url)}|{max_size}|{quality}"
+    key = hashlib.sha256(raw_key.encode()).hexdigest()
+
+    cache = get_image_cache()
+    try:
+        data = cache.get(key)
+    except Exception:
+        logger.exception("Image cache read failed for %s", issue.tracking_id)
+        data = None
+    if data is not None:
+        return data
+
+    data = preprocess_image(load_issue_image(issue), max_size, quality)
+    try:
+        cache.set(key, data)
+    except Exception:
+        logger.exception("Image cache write failed for %s", issue.tracking_id)
+    return data
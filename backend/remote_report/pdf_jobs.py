@@ -0,0 +1,135 @@
+"""
+Asynchronous PDF rendering backed by the PDFRenderJob table.
+
+Web requests only insert a queued row. Workers started with
+`manage.py run_pdf_workers` claim rows with SELECT ... FOR UPDATE SKIP
+LOCKED, render them with the regular briefing layout and store the
+result through the default file storage.
+"""
+
+import logging
+import time
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import IssueReportRemote, PDFRenderJob
+from .pdf_cache import get_cached_issue_pdf
+from .pdf_pack import build_pack
+
+logger = logging.getLogger(__name__)
+
+
+def submit_job(user, issues, fmt):
+    return PDFRenderJob.objects.create(
+        requested_by=user.userid,
+        department=user.department,
+        tracking_ids=[issue.tracking_id for issue in issues],
+        format=fmt,
+    )
+
+
+def claim_next_job():
+    """
+    Marks the oldest queued job as running and returns it, or None.
+    """
+    with transaction.atomic():
+        job = (
+            PDFRenderJob.objects.select_for_update(skip_locked=True)
+            .filter(status="queued")
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = "running"
+        job.started_at = timezone.now()
+        job.attempts += 1
+        job.save(update_fields=["status", "started_at", "attempts"])
+    return job
+
+
+def run_job(job):
+    issues = {
+        issue.tracking_id: issue
+        for issue in IssueReportRemote.objects.filter(
+            department=job.department, tracking_id__in=job.tracking_ids
+        )
+    }
+    issues = [issues[t] for t in job.tracking_ids if t in issues]
+    if not issues:
+        raise ValueError("None of the requested issues exist any more")
+
+    pdfs = [get_cached_issue_pdf(issue) for issue in issues]
+
+    if job.format == "pdf" and len(pdfs) == 1:
+        content = BytesIO(pdfs[0])
+    else:
+        content = build_pack(issues, pdfs, job.format)
+
+    with content:
+        job.result.save(f"{job.job_id}.{job.format}", File(content), save=False)
+
+
+def process_job(job):
+    max_attempts = getattr(settings, "PDF_JOB_MAX_ATTEMPTS", 3)
+
+    try:
+        run_job(job)
+    except Exception as e:
+        logger.exception("PDF job %s failed", job.job_id)
+        job.error = str(e)
+        job.status = "queued" if job.attempts < max_attempts else "failed"
+        if job.status == "failed":
+            job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at"])
+        return
+
+    job.status = "done"
+    job.error = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "result", "finished_at"])
+
+
+def requeue_stale_jobs():
+    """
+    Puts back jobs whose worker died mid-render, or fails them once they
+    have used up their attempts.
+    """
+    timeout = getattr(settings, "PDF_JOB_TIMEOUT", 300)
+    max_attempts = getattr(settings, "PDF_JOB_MAX_ATTEMPTS", 3)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+
+    stale = PDFRenderJob.objects.filter(status="running", started_at__lt=cutoff)
+    stale.filter(attempts__lt=max_attempts).update(status="queued")
+    stale.filter(attempts__gte=max_attempts).update(
+        status="failed",
+        error="Worker timed out",
+        finished_at=timezone.now(),
+    )
+
+
+def work(poll_interval=1.0, once=False, should_stop=lambda: False):
+    """
+    Worker loop: claims and processes jobs until stopped. With `once`, it
+    returns as soon as the queue is empty.
+    """
+    last_sweep = 0.0
+    while not should_stop():
+        if time.monotonic() - last_sweep > 60:
+            requeue_stale_jobs()
+            last_sweep = time.monotonic()
+
+        job = claim_next_job()
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        process_job(job)
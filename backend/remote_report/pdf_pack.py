@@ -0,0 +1,128 @@
+"""
+Multi-issue briefing packs: per-issue PDFs rendered across a process
+pool and combined into one merged PDF or a zip archive.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from multiprocessing import get_all_start_methods, get_context
+
+from django.conf import settings
+
+from admin_hub.workers import init_django_worker
+
+from .pdf import render_issue_pdf
+from .pdf_cache import get_pdf_cache, pdf_cache_key, store_briefing
+
+try:
+    from pypdf import PdfWriter
+except ImportError:  # pragma: no cover - merged packs need pypdf
+    PdfWriter = None
+
+logger = logging.getLogger(__name__)
+
+PACK_FORMATS = ["pdf", "zip"]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool():
+    """
+    Returns the shared render pool. Workers are started through a fork
+    server (spawn where unavailable) rather than forked from the web
+    worker, which has threads holding locks and open S3 sockets.
+    """
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                method = (
+                    "forkserver"
+                    if "forkserver" in get_all_start_methods()
+                    else "spawn"
+                )
+                _pool = ProcessPoolExecutor(
+                    max_workers=getattr(
+                        settings, "PDF_PACK_WORKERS", min(4, os.cpu_count() or 1)
+                    ),
+                    mp_context=get_context(method),
+                    initializer=init_django_worker,
+                )
+    return _pool
+
+
+def _reset_render_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def render_issue_pdfs(issues):
+    """
+    Returns the briefing PDFs for `issues`, in order.
+
+    Cached briefings are reused; the rest are rendered in the process
+    pool and written back to the cache when complete.
+    """
+    cache = get_pdf_cache()
+    pdfs = [None] * len(issues)
+    keys = [pdf_cache_key(i.tracking_id, i.updated_at) for i in issues]
+
+    if cache is not None:
+        for n, key in enumerate(keys):
+            try:
+                pdfs[n] = cache.get(key)
+            except Exception:
+                logger.exception("PDF cache read failed for %s", issues[n].tracking_id)
+
+    misses = [n for n, pdf in enumerate(pdfs) if pdf is None]
+    if not misses:
+        return pdfs
+
+    to_render = [issues[n] for n in misses]
+    try:
+        rendered = list(get_render_pool().map(render_issue_pdf, to_render))
+    except BrokenProcessPool:
+        logger.exception("PDF render pool broke, rendering pack serially")
+        _reset_render_pool()
+        rendered = [render_issue_pdf(issue) for issue in to_render]
+
+    for n, briefing in zip(misses, rendered):
+        pdfs[n] = briefing.pdf
+        store_briefing(cache, keys[n], issues[n], briefing)
+
+    return pdfs
+
+
+def build_pack(issues, pdfs, fmt):
+    """
+    Writes the pack into a spooled temp file (memory first, disk once it
+    grows past PDF_PACK_SPOOL_BYTES) and returns it rewound.
+    """
+    spool = tempfile.SpooledTemporaryFile(
+        max_size=getattr(settings, "PDF_PACK_SPOOL_BYTES", 8 * 1024 * 1024)
+    )
+
+    if fmt == "zip":
+        with zipfile.ZipFile(spool, "w", compression=zipfile.ZIP_STORED) as zf:
+            for issue, pdf in zip(issues, pdfs):
+                zf.writestr(f"issue_{issue.tracking_id}.pdf", pdf)
+    else:
+        writer = PdfWriter()
+        for pdf in pdfs:
+            writer.append(BytesIO(pdf))
+        writer.write(spool)
+
+    spool.seek(0)
+    return spool
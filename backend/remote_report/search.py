@@ -0,0 +1,318 @@
+"""
+Ranked full-text search over issue title, description and location.
+
+On MySQL the database does the matching and ranking through the FULLTEXT
+index added by `create_issue_search_index`; without that index, search
+answers 503 rather than quietly indexing the table in every worker. On
+other databases (SQLite in development), or with ISSUE_SEARCH_BACKEND =
+"memory", each worker keeps an in-memory inverted index for every
+department that has been searched, brought up to date from rows whose
+`updated_at` moved since the last refresh.
+"""
+
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from admin_hub.pagination import iter_by_id
+
+from .models import IssueReportRemote
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ["issue_title", "issue_description", "location"]
+FULLTEXT_INDEX_NAME = "issue_search_ft"
+
+# Term weights per field for the in-memory ranking
+FIELD_WEIGHTS = {"issue_title": 3, "location": 2, "issue_description": 1}
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Matches MySQL's default InnoDB token size and a small stopword list
+MIN_TOKEN_LENGTH = 3
+STOPWORDS = frozenset(
+    "and are but for from has have into near not that the this was were "
+    "with".split()
+)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Seconds before a missing FULLTEXT index is looked for again
+FULLTEXT_RECHECK = 60
+
+
+class SearchUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Search is not available."
+    default_code = "search_unavailable"
+
+
+def tokenize(text):
+    return [
+        t
+        for t in TOKEN_RE.findall((text or "").lower())
+        if len(t) >= MIN_TOKEN_LENGTH and t not in STOPWORDS
+    ]
+
+
+_fulltext_checked_at = None
+_fulltext_available = False
+
+
+def fulltext_available():
+    """
+    True when the FULLTEXT index exists. Once found it is trusted for the
+    life of the process; a miss is rechecked every FULLTEXT_RECHECK
+    seconds, so creating the index takes effect without a restart.
+    """
+    global _fulltext_checked_at, _fulltext_available
+
+    if connection.vendor != "mysql":
+        return False
+    if _fulltext_available:
+        return True
+
+    now = time.monotonic()
+    if _fulltext_checked_at is None or now - _fulltext_checked_at >= FULLTEXT_RECHECK:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s "
+                "AND index_name = %s LIMIT 1",
+                [IssueReportRemote._meta.db_table, FULLTEXT_INDEX_NAME],
+            )
+            _fulltext_available = cursor.fetchone() is not None
+        _fulltext_checked_at = now
+    return _fulltext_available
+
+
+def use_fulltext():
+    """
+    Picks the backend. The in-memory index is used only when configured
+    explicitly or off MySQL; MySQL without the index raises
+    SearchUnavailable.
+    """
+    if getattr(settings, "ISSUE_SEARCH_BACKEND", "auto") == "memory":
+        return False
+    if connection.vendor != "mysql":
+        return False
+    if fulltext_available():
+        return True
+
+    logger.error(
+        "FULLTEXT index %s is missing; run `manage.py create_issue_search_index`",
+        FULLTEXT_INDEX_NAME,
+    )
+    raise SearchUnavailable()
+
+
+def search_fulltext(query, department, status=None, offset=0, limit=20):
+    """
+    Returns [(id, score)] ranked by MySQL's natural language relevance.
+    """
+    columns = ", ".join(connection.ops.quote_name(f) for f in SEARCH_FIELDS)
+    score = RawSQL(
+        f"MATCH ({columns}) AGAINST (%s IN NATURAL LANGUAGE MODE)", (query,)
+    )
+
+    issues = IssueReportRemote.objects.filter(department=department)
+    if status:
+        issues = issues.filter(status=status)
+
+    return list(
+        issues.annotate(score=score)
+        .filter(score__gt=0)
+        .order_by("-score", "-id")
+        .values_list("id", "score")[offset : offset + limit]
+    )
+
+
+class _Doc:
+    __slots__ = ("status", "terms", "length")
+
+    def __init__(self, status, terms):
+        self.status = status
+        self.terms = terms
+        self.length = sum(terms.values())
+
+
+class DepartmentIndex:
+    """
+    term -> {issue id: weighted term frequency} postings for one
+    department.
+
+    refresh() re-reads the department's rows with `updated_at` at or
+    after the last one seen, so edits, status changes and new issues are
+    picked up without rebuilding. Rows deleted or moved to another
+    department linger until the process restarts; search results are
+    hydrated from the database, which drops them.
+    """
+
+    def __init__(self, department, refresh_interval=5, chunk_size=2000):
+        self.department = department
+        self.refresh_interval = refresh_interval
+        self.chunk_size = chunk_size
+        self._docs = {}
+        self._postings = defaultdict(dict)
+        self._total_length = 0
+        self._watermark = None
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _remove(self, pk):
+        doc = self._docs.pop(pk, None)
+        if doc is None:
+            return
+        for term in doc.terms:
+            entries = self._postings.get(term)
+            if entries is not None:
+                entries.pop(pk, None)
+                if not entries:
+                    del self._postings[term]
+        self._total_length -= doc.length
+
+    def _add(self, pk, status, values):
+        terms = Counter()
+        for field, text in zip(SEARCH_FIELDS, values):
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                terms[token] += weight
+
+        doc = _Doc(status, terms)
+        self._docs[pk] = doc
+        for term, tf in terms.items():
+            self._postings[term][pk] = tf
+        self._total_length += doc.length
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if (
+            not force
+            and self._refreshed_at is not None
+            and now - self._refreshed_at < self.refresh_interval
+        ):
+            return
+
+        # One refresher at a time; other searches use the current state,
+        # except on first use, when they wait for the initial build
+        if not self._refresh_lock.acquire(blocking=self._refreshed_at is None):
+            return
+        try:
+            if self._refreshed_at is not None and not force and (
+                now - self._refreshed_at < self.refresh_interval
+            ):
+                return
+
+            rows = IssueReportRemote.objects.filter(department=self.department)
+            if self._watermark is not None:
+                # >= so rows sharing the watermark's timestamp aren't missed;
+                # re-indexing a row is idempotent
+                rows = rows.filter(updated_at__gte=self._watermark)
+            rows = iter_by_id(
+                rows.values_list("id", "status", "updated_at", *SEARCH_FIELDS),
+                self.chunk_size,
+                itemgetter(0),
+            )
+
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.chunk_size:
+                    self._apply(batch)
+                    batch = []
+            if batch:
+                self._apply(batch)
+
+            self._refreshed_at = now
+        finally:
+            self._refresh_lock.release()
+
+    def _apply(self, rows):
+        with self._lock:
+            for pk, status, updated_at, *values in rows:
+                self._remove(pk)
+                self._add(pk, status, values)
+                if self._watermark is None or updated_at > self._watermark:
+                    self._watermark = updated_at
+
+    def search(self, query, status=None, offset=0, limit=20):
+        """
+        Returns [(id, score)] ranked by BM25 over field-weighted terms.
+        """
+        terms = set(tokenize(query))
+
+        with self._lock:
+            count = len(self._docs)
+            if not count or not terms:
+                return []
+            avg_length = self._total_length / count or 1
+
+            scores = defaultdict(float)
+            for term in terms:
+                entries = self._postings.get(term)
+                if not entries:
+                    continue
+                idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+                for pk, tf in entries.items():
+                    doc = self._docs[pk]
+                    if status and doc.status != status:
+                        continue
+                    norm = K1 * (1 - B + B * doc.length / avg_length)
+                    scores[pk] += idf * tf * (K1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(
+            offset + limit, scores.items(), key=lambda item: (item[1], item[0])
+        )
+        return top[offset:]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_department_index(department):
+    """
+    Returns this worker's index for `department`, creating it on the
+    department's first search. Departments nobody searches are never
+    loaded.
+    """
+    index = _indexes.get(department)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(department)
+            if index is None:
+                index = DepartmentIndex(
+                    department,
+                    refresh_interval=getattr(
+                        settings, "ISSUE_SEARCH_REFRESH_INTERVAL", 5
+                    ),
+                )
+                _indexes[department] = index
+    return index
+
+
+def search_issues(query, department, status=None, offset=0, limit=20):
+    """
+    Returns one page of [(id, score)] for `query` in `department`, best
+    match first.
+    """
+    if use_fulltext():
+        return search_fulltext(query, department, status, offset, limit)
+
+    index = get_department_index(department)
+    index.refresh()
+    return index.search(query, status, offset, limit)
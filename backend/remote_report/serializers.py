@@ -1,7 +1,23 @@
 from rest_framework import serializers
 from .models import IssueReportRemote
 
-class IssueReportSerializer(serializers.ModelSerializer):
+
+class DynamicFieldsMixin:
+    """
+    Accepts an optional `fields` keyword argument and drops every
+    serializer field not listed in it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class IssueReportSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = IssueReportRemote
         fields = [
@@ -19,3 +35,16 @@ class IssueReportSerializer(serializers.ModelSerializer):
             "image_url",
             "completion_url",
         ]
+
+
+# Columns the list screens actually render
+ISSUE_LIST_FIELDS = [
+    "id",
+    "tracking_id",
+    "issue_title",
+    "location",
+    "issue_date",
+    "updated_at",
+    "status",
+    "allocated_to",
+]
@@ -0,0 +1,213 @@
+import threading
+import time
+from urllib.parse import urlparse, unquote
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+from admin_hub import s3 as s3_clients
+
+
+def extract_s3_key(value: str) -> str:
+    """
+    Accepts either:
+    - raw S3 key: reports/6/file.jpg
+    - full S3 URL (encoded or not)
+
+    Returns:
+    - clean S3 object key
+    """
+    if not value:
+        return None
+
+    # Case 1: Already a key
+    if not value.startswith("http"):
+        return value
+
+    # Case 2: Full S3 URL
+    parsed = urlparse(value)
+
+    # Remove leading slash and decode %2F etc
+    return unquote(parsed.path.lstrip("/"))
+
+
+def get_s3_client():
+    return s3_clients.get_client()
+
+
+def report_bucket_name():
+    bucket_name = (
+        getattr(settings, "REPORT_IMAGES_BUCKET", None)
+        or getattr(settings, "AWS_STORAGE_BUCKET_NAME", None)
+    )
+
+    if not bucket_name:
+        raise RuntimeError("No S3 bucket configured")
+
+    return bucket_name
+
+
+def generate_presigned_get(value, expires_in=300):
+    key = extract_s3_key(value)
+    if not key:
+        return None
+
+    bucket_name = report_bucket_name()
+
+    def sign():
+        return get_s3_client().generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": bucket_name,
+                "Key": key,
+            },
+            ExpiresIn=expires_in,
+        )
+
+    return s3_clients.presigned_urls.get_or_sign(bucket_name, key, expires_in, sign)
+
+
+class StorageUnavailable(Exception):
+    """
+    Raised when an object can't be read within its latency budget, or
+    without trying at all while the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and fails fast for
+    `cooldown` seconds. After that a single trial call is let through;
+    its outcome closes the breaker again or restarts the cooldown.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running:
+                return False
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+read_breaker = CircuitBreaker(
+    threshold=getattr(settings, "S3_BREAKER_THRESHOLD", 5),
+    cooldown=getattr(settings, "S3_BREAKER_COOLDOWN", 30),
+)
+
+
+def read_object(value, budget=None):
+    """
+    Reads a report object straight from S3 over the pooled keep-alive
+    client, without presigning or a separate HTTP session.
+
+    The whole read, retries included, should finish within `budget`
+    seconds (S3_READ_BUDGET by default). Raises StorageUnavailable
+    otherwise, or immediately while the circuit breaker is open.
+
+    The budget is enforced between socket operations, not during them:
+    an attempt only starts if its connect and read timeouts fit in what
+    is left, and the body is checked against the deadline after each
+    chunk. A read that stalls mid-body can therefore overrun the budget
+    by at most one S3_READ_TIMEOUT.
+    """
+    key = extract_s3_key(value)
+    if not key:
+        raise StorageUnavailable("No object key")
+
+    if budget is None:
+        budget = getattr(settings, "S3_READ_BUDGET", 2.5)
+    retries = getattr(settings, "S3_READ_RETRIES", 1)
+    max_bytes = getattr(settings, "S3_READ_MAX_BYTES", 20 * 1024 * 1024)
+
+    # Set up before asking the breaker: an error here while holding the
+    # half-open trial would leave it taken for good
+    client = s3_clients.get_client(profile="read")
+    bucket_name = report_bucket_name()
+
+    if not read_breaker.allow():
+        raise StorageUnavailable("S3 reads are failing, circuit open")
+
+    try:
+        return _read_with_retries(client, bucket_name, key, budget, retries, max_bytes)
+    except StorageUnavailable:
+        raise
+    except Exception:
+        # Unexpected errors still settle the breaker, releasing the trial
+        read_breaker.record_failure()
+        raise
+
+
+def _read_with_retries(client, bucket_name, key, budget, retries, max_bytes):
+    deadline = time.monotonic() + budget
+    # Worst case for getting the response headers of one attempt
+    attempt_cost = getattr(settings, "S3_READ_CONNECT_TIMEOUT", 0.5) + getattr(
+        settings, "S3_READ_TIMEOUT", 1
+    )
+    last_error = None
+
+    for attempt in range(retries + 1):
+        # The first attempt always runs, even on a budget tighter than
+        # the timeouts; retries only when they can finish in time
+        if attempt and deadline - time.monotonic() < attempt_cost:
+            break
+        try:
+            data = _read_before(client, bucket_name, key, deadline, max_bytes)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("NoSuchKey", "404", "AccessDenied", "403"):
+                # The object is the problem, not S3; don't trip the breaker
+                read_breaker.record_success()
+                raise StorageUnavailable(f"{code}: {key}") from e
+            last_error = e
+        except StorageUnavailable:
+            read_breaker.record_success()
+            raise
+        except (BotoCoreError, TimeoutError) as e:
+            last_error = e
+        else:
+            read_breaker.record_success()
+            return data
+
+    read_breaker.record_failure()
+    raise StorageUnavailable(f"Could not read {key}: {last_error}")
+
+
+def _read_before(client, bucket_name, key, deadline, max_bytes):
+    obj = client.get_object(Bucket=bucket_name, Key=key)
+    if obj.get("ContentLength", 0) > max_bytes:
+        obj["Body"].close()
+        raise StorageUnavailable(f"Object too large: {key}")
+
+    body = obj["Body"]
+    chunks = []
+    for chunk in body.iter_chunks(64 * 1024):
+        chunks.append(chunk)
+        if time.monotonic() > deadline:
+            body.close()
+            raise TimeoutError(f"Read budget exceeded: {key}")
+    return b"".join(chunks)
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min
+
+from .models import IssueReportRemote
+
+ISSUE_STATUSES = ["pending", "in_progress", "escalated", "resolved"]
+OPEN_STATUSES = ["pending", "in_progress", "escalated"]
+
+
+def summary_cache_key(department):
+    return f"issue-summary:{department}"
+
+
+def compute_department_summary(department):
+    """
+    Per-status counts and the oldest open issue date, from a single
+    GROUP BY over the department's rows.
+    """
+    rows = (
+        IssueReportRemote.objects.filter(department=department)
+        .order_by()
+        .values("status")
+        .annotate(count=Count("id"), oldest=Min("issue_date"))
+    )
+
+    counts = dict.fromkeys(ISSUE_STATUSES, 0)
+    oldest_open = None
+    for row in rows:
+        counts[row["status"]] = row["count"]
+        if row["status"] in OPEN_STATUSES and row["oldest"] is not None:
+            if oldest_open is None or row["oldest"] < oldest_open:
+                oldest_open = row["oldest"]
+
+    return {"counts": counts, "oldest_open_issue_date": oldest_open}
+
+
+def get_department_summary(department):
+    key = summary_cache_key(department)
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_department_summary(department)
+        # Issues are also created by the citizen app, which can't invalidate
+        # this cache, so entries expire on their own as well
+        cache.set(
+            key,
+            summary,
+            timeout=getattr(settings, "ISSUE_SUMMARY_CACHE_TIMEOUT", 30),
+        )
+    return summary
+
+
+def invalidate_department_summary(department):
+    cache.delete(summary_cache_key(department))
@@ -1,3 +1,624 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from botocore.exceptions import EndpointConnectionError
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from accounts.models import User
+
+from . import search
+from .fastjson import IssueRowEncoder
+from .management.commands.bench_issue_serialization import make_rows
+from .models import IssueReportRemote, RenderLock
+from .pdf import Briefing
+from .pdf_cache import _get_or_render, _render_and_store
+from .serializers import IssueReportSerializer
+from .storage import CircuitBreaker, StorageUnavailable, read_object
+
+
+class IssueTableMixin:
+    """
+    Creates the citizen app's report table, which Django doesn't manage,
+    for the duration of the test class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            editor.create_model(IssueReportRemote)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(IssueReportRemote)
+
+
+class IssueAPITestCase(IssueTableMixin, TestCase):
+    def setUp(self):
+        self.officer = User.objects.create_user(
+            "OFF001", password="pw", department="Roads"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def make_issue(self, tracking_id, status):
+        now = timezone.now()
+        return IssueReportRemote.objects.create(
+            tracking_id=tracking_id,
+            status=status,
+            issue_title="Broken streetlight",
+            issue_description="Out since Monday",
+            location="Market Road",
+            issue_date=now,
+            updated_at=now,
+            user_id=1,
+            department="Roads",
+        )
+
+
+
+class IssueRowEncoderTests(TestCase):
+    def test_matches_serializer_output(self):
+        encoder = IssueRowEncoder(IssueReportSerializer.Meta.fields)
+        for tz in ["UTC", "Asia/Kolkata"]:
+            with self.subTest(tz=tz), timezone.override(tz):
+                instances, rows = make_rows(20, encoder.columns)
+                self.assertEqual(
+                    encoder.encode(rows),
+                    JSONRenderer().render(
+                        IssueReportSerializer(instances, many=True).data
+                    ),
+                )
+
+
+class IssueListTests(IssueAPITestCase):
+    def test_unchanged_list_revalidates_by_etag_only(self):
+        self.make_issue("TRK1", "pending")
+
+        response = self.client.get("/restapi/issues/")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Last-Modified", response)
+
+        response = self.client.get(
+            "/restapi/issues/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_resolved_row_leaving_bucket_changes_etag(self):
+        self.make_issue("TRK1", "pending")
+        self.make_issue("TRK2", "in_progress")
+        etag = self.client.get("/restapi/issues/")["ETag"]
+
+        IssueReportRemote.objects.filter(tracking_id="TRK2").update(
+            status="resolved"
+        )
+
+        response = self.client.get("/restapi/issues/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_pages_skip_the_fingerprint(self):
+        self.make_issue("TRK1", "pending")
+
+        # Page query only, no aggregate over the bucket
+        with self.assertNumQueries(1):
+            response = self.client.get("/restapi/issues/?page_size=10")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+    def test_pages_walk_rows_sharing_an_issue_date(self):
+        for n in range(7):
+            self.make_issue(f"TRK{n}", "resolved")
+        IssueReportRemote.objects.update(issue_date=timezone.now())
+        expected = list(
+            IssueReportRemote.objects.order_by("-id").values_list(
+                "tracking_id", flat=True
+            )
+        )
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"status": "resolved", "page_size": 3}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.client.get("/restapi/issues/", params).json()
+            seen += [row["tracking_id"] for row in data["results"]]
+            pages += 1
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+
+
+class IssueDeltaTests(IssueAPITestCase):
+    def stamp(self, tracking_id, status, updated_at):
+        self.make_issue(tracking_id, status)
+        IssueReportRemote.objects.filter(tracking_id=tracking_id).update(
+            updated_at=updated_at
+        )
+
+    def get_delta(self, since):
+        return self.client.get(
+            "/restapi/issues/", {"updated_since": since.isoformat()}
+        ).json()
+
+    def test_changed_and_removed_rows(self):
+        since = timezone.now() - timedelta(hours=1)
+        self.stamp("TRK0", "pending", since - timedelta(minutes=1))
+        self.stamp("TRK1", "pending", since + timedelta(minutes=1))
+        self.stamp("TRK2", "resolved", since + timedelta(minutes=2))
+
+        data = self.get_delta(since)
+
+        self.assertFalse(data["reset"])
+        self.assertEqual([r["tracking_id"] for r in data["results"]], ["TRK1"])
+        self.assertEqual(data["removed"], ["TRK2"])
+        self.assertEqual(
+            data["watermark"],
+            (since + timedelta(minutes=2)).isoformat().replace("+00:00", "Z"),
+        )
+
+    @override_settings(ISSUE_DELTA_LIMIT=1)
+    def test_too_many_changes_ask_for_reset(self):
+        since = timezone.now() - timedelta(hours=1)
+        self.stamp("TRK1", "pending", since + timedelta(minutes=1))
+        self.stamp("TRK2", "pending", since + timedelta(minutes=2))
+
+        data = self.get_delta(since)
+
+        self.assertEqual(
+            data, {"reset": True, "results": [], "removed": [], "watermark": None}
+        )
+
+    def test_row_committed_late_is_still_delivered(self):
+        now = timezone.now()
+        self.stamp("TRK1", "pending", now - timedelta(seconds=5))
+        data = self.get_delta(now - timedelta(hours=1))
+        self.assertEqual(len(data["results"]), 1)
+
+        # Stamped before TRK1 but committed after the first call
+        self.stamp("TRK2", "pending", now - timedelta(seconds=10))
+        data = self.get_delta(parse_datetime(data["watermark"]))
+
+        self.assertIn("TRK2", [r["tracking_id"] for r in data["results"]])
+
+
+class IssueExportTests(IssueAPITestCase):
+    @override_settings(ISSUE_EXPORT_CHUNK_SIZE=2)
+    def test_csv_export_pages_through_every_row(self):
+        for n in range(5):
+            self.make_issue(f"TRK{n}", "pending")
+
+        # One query per chunk of two rows, plus the empty tail check
+        with self.assertNumQueries(3):
+            response = self.client.get("/restapi/issues/export/?file_format=csv")
+            lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[0].startswith("id,"))
+        self.assertEqual(
+            sorted(line.split(",")[1] for line in lines[1:]),
+            [f"TRK{n}" for n in range(5)],
+        )
+
+
+class IssueStatusUpdateTests(IssueAPITestCase):
+    def patch_status(self, tracking_id, status):
+        return self.client.patch(
+            f"/restapi/issues/{tracking_id}/status/",
+            {"status": status},
+            format="json",
+        )
+
+    def test_legal_transition(self):
+        self.make_issue("TRK1", "pending")
+
+        response = self.patch_status("TRK1", "in_progress")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"status": "in_progress", "allocated_to": "OFF001"}
+        )
+        issue = IssueReportRemote.objects.get(tracking_id="TRK1")
+        self.assertEqual(issue.status, "in_progress")
+        self.assertEqual(issue.allocated_to, "OFF001")
+
+    def test_illegal_transition(self):
+        self.make_issue("TRK2", "pending")
+
+        response = self.patch_status("TRK2", "resolved")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["status"], "pending")
+        self.assertEqual(
+            IssueReportRemote.objects.get(tracking_id="TRK2").status, "pending"
+        )
+
+    def test_missing_issue(self):
+        response = self.patch_status("NOPE", "in_progress")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_lost_race_is_a_conflict(self):
+        # Another officer claimed the issue between read and write
+        self.make_issue("TRK3", "in_progress")
+
+        response = self.patch_status("TRK3", "in_progress")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.json(),
+            {
+                "detail": "In Progress can only move to Escalated or Resolved",
+                "status": "in_progress",
+            },
+        )
+
+    def test_escalated_under_resolver_is_a_conflict(self):
+        self.make_issue("TRK4", "escalated")
+
+        response = self.patch_status("TRK4", "resolved")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["status"], "escalated")
+        self.assertNotIn("retry", response.json()["detail"])
+
+    def test_other_department_is_not_found(self):
+        issue = self.make_issue("TRK5", "pending")
+        IssueReportRemote.objects.filter(pk=issue.pk).update(department="Water")
+
+        with mock.patch(
+            "remote_report.views.invalidate_department_summary"
+        ) as invalidate:
+            response = self.patch_status("TRK5", "in_progress")
+
+        self.assertEqual(response.status_code, 404)
+        invalidate.assert_not_called()
+        self.assertEqual(
+            IssueReportRemote.objects.get(tracking_id="TRK5").status, "pending"
+        )
+
+
+class IssueBulkStatusUpdateTests(IssueAPITestCase):
+    def post_bulk(self, tracking_ids, status="in_progress"):
+        with mock.patch(
+            "remote_report.views.invalidate_department_summary"
+        ) as invalidate:
+            response = self.client.post(
+                "/restapi/issues/bulk-status/",
+                {"status": status, "tracking_ids": tracking_ids},
+                format="json",
+            )
+        return response, invalidate
+
+    def test_mixed_results(self):
+        self.make_issue("TRK1", "pending")
+        self.make_issue("TRK2", "resolved")
+        other = self.make_issue("TRK3", "pending")
+        IssueReportRemote.objects.filter(pk=other.pk).update(department="Water")
+
+        response, invalidate = self.post_bulk(["TRK1", "TRK2", "TRK3", "NOPE"])
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["updated"], 1)
+        self.assertEqual(
+            [(r["tracking_id"], r["ok"], r.get("error")) for r in data["results"]],
+            [
+                ("TRK1", True, None),
+                ("TRK2", False, "invalid"),
+                ("TRK3", False, "not_found"),
+                ("NOPE", False, "not_found"),
+            ],
+        )
+        statuses = dict(
+            IssueReportRemote.objects.values_list("tracking_id", "status")
+        )
+        self.assertEqual(
+            statuses, {"TRK1": "in_progress", "TRK2": "resolved", "TRK3": "pending"}
+        )
+        self.assertEqual(
+            IssueReportRemote.objects.get(tracking_id="TRK1").allocated_to, "OFF001"
+        )
+        invalidate.assert_called_once_with("Roads")
+
+    def test_duplicate_ids_are_reported_once(self):
+        self.make_issue("TRK1", "pending")
+
+        response, _ = self.post_bulk(["TRK1", "TRK1"])
+
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    @override_settings(ISSUE_BULK_LIMIT=2)
+    def test_over_limit_is_rejected(self):
+        self.make_issue("TRK1", "pending")
+
+        response, invalidate = self.post_bulk(["TRK1", "TRK2", "TRK3"])
+
+        self.assertEqual(response.status_code, 400)
+        invalidate.assert_not_called()
+        self.assertEqual(
+            IssueReportRemote.objects.get(tracking_id="TRK1").status, "pending"
+        )
+
+    def test_nothing_updated_keeps_summary(self):
+        self.make_issue("TRK1", "resolved")
+
+        response, invalidate = self.post_bulk(["TRK1"])
+
+        self.assertEqual(response.json()["updated"], 0)
+        invalidate.assert_not_called()
+
+    def test_unknown_status_is_rejected(self):
+        response, _ = self.post_bulk(["TRK1"], status="closed")
+
+        self.assertEqual(response.status_code, 400)
+
+
+class IssueSearchTests(IssueTableMixin, TestCase):
+    def setUp(self):
+        search._indexes.clear()
+
+    def test_index_holds_only_searched_departments(self):
+        now = timezone.now()
+        for tracking_id, department in [("TRK1", "Roads"), ("TRK2", "Water")]:
+            IssueReportRemote.objects.create(
+                tracking_id=tracking_id,
+                status="pending",
+                issue_title="Broken streetlight",
+                issue_description="Out since Monday",
+                location="Market Road",
+                issue_date=now,
+                updated_at=now,
+                user_id=1,
+                department=department,
+            )
+
+        results = search.search_issues("streetlight", "Roads")
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(list(search._indexes), ["Roads"])
+
+    @override_settings(ISSUE_SEARCH_BACKEND="auto")
+    def test_mysql_without_index_is_unavailable(self):
+        with mock.patch.object(search.connection, "vendor", "mysql"), \
+                mock.patch.object(search, "fulltext_available", return_value=False):
+            with self.assertRaises(search.SearchUnavailable), \
+                    self.assertLogs("remote_report.search", "ERROR"):
+                search.search_issues("streetlight", "Roads")
+        self.assertEqual(search._indexes, {})
+
+
+class MemoryCache(dict):
+    def set(self, key, data):
+        self[key] = data
+
+
+def unsaved_issue():
+    now = timezone.now()
+    return IssueReportRemote(
+        id=1,
+        tracking_id="TRK1",
+        status="pending",
+        issue_title="Broken streetlight",
+        issue_description="Out since Monday",
+        location="Market Road",
+        image_url="https://bucket.s3.amazonaws.com/issues/photo.jpg",
+        issue_date=now,
+        updated_at=now,
+        user_id=1,
+        department="Roads",
+    )
+
+
+class BriefingCacheTests(TestCase):
+
+    def test_briefing_without_its_photo_is_not_cached(self):
+        cache = MemoryCache()
+        issue = unsaved_issue()
+
+        with mock.patch(
+            "remote_report.pdf.prepare_issue_image",
+            side_effect=StorageUnavailable("timed out"),
+        ):
+            pdf = _render_and_store(cache, "key", issue)
+
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        self.assertEqual(cache, {})
+
+    def test_complete_briefing_is_cached(self):
+        cache = MemoryCache()
+        issue = unsaved_issue()
+        issue.image_url = None
+
+        pdf = _render_and_store(cache, "key", issue)
+
+        self.assertEqual(cache, {"key": pdf})
+
+
+@override_settings(PDF_RENDER_LOCKS=True, SINGLE_FLIGHT_WAIT=5)
+class RenderLockTests(TestCase):
+    key = "briefing-key"
+
+    def setUp(self):
+        self.cache = MemoryCache()
+        self.issue = unsaved_issue()
+        render = mock.patch(
+            "remote_report.pdf_cache.render_issue_pdf",
+            return_value=Briefing(b"%PDF mine", True),
+        )
+        self.render = render.start()
+        self.addCleanup(render.stop)
+
+    def hold_lock(self, expires_in=60):
+        RenderLock.objects.create(
+            key=self.key, expires_at=timezone.now() + timedelta(seconds=expires_in)
+        )
+
+    def poll(self, side_effect):
+        return mock.patch("remote_report.pdf_cache.time.sleep", side_effect=side_effect)
+
+    def test_free_lock_renders_and_releases(self):
+        pdf = _get_or_render(self.cache, self.key, self.issue)
+
+        self.assertEqual(pdf, b"%PDF mine")
+        self.assertEqual(self.cache, {self.key: b"%PDF mine"})
+        self.assertFalse(RenderLock.objects.exists())
+
+    def test_waits_for_other_workers_render(self):
+        self.hold_lock()
+
+        def other_worker_finishes(seconds):
+            self.cache[self.key] = b"%PDF theirs"
+
+        with self.poll(other_worker_finishes):
+            pdf = _get_or_render(self.cache, self.key, self.issue)
+
+        self.assertEqual(pdf, b"%PDF theirs")
+        self.render.assert_not_called()
+
+    def test_renders_itself_when_holder_leaves_nothing(self):
+        self.hold_lock()
+
+        def other_worker_fails(seconds):
+            RenderLock.objects.all().delete()
+
+        with self.poll(other_worker_fails):
+            pdf = _get_or_render(self.cache, self.key, self.issue)
+
+        self.assertEqual(pdf, b"%PDF mine")
+        self.render.assert_called_once()
+
+    @override_settings(SINGLE_FLIGHT_WAIT=0)
+    def test_renders_itself_after_wait_timeout(self):
+        self.hold_lock()
+
+        pdf = _get_or_render(self.cache, self.key, self.issue)
+
+        self.assertEqual(pdf, b"%PDF mine")
+        # The other worker's lock is left for it to release
+        self.assertTrue(RenderLock.objects.exists())
+
+    def test_expired_lock_is_taken_over(self):
+        self.hold_lock(expires_in=-1)
+
+        with self.poll(AssertionError("should not wait")):
+            pdf = _get_or_render(self.cache, self.key, self.issue)
+
+        self.assertEqual(pdf, b"%PDF mine")
+        self.assertFalse(RenderLock.objects.exists())
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        clock = mock.patch(
+            "remote_report.storage.time.monotonic", side_effect=lambda: self.now
+        )
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.breaker = CircuitBreaker(threshold=2, cooldown=30)
+
+    def trip(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_opens_after_threshold_failures(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+
+    def test_lets_one_trial_through_after_cooldown(self):
+        self.trip()
+        self.now += 29
+        self.assertFalse(self.breaker.allow())
+
+        self.now += 1
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_trial_closes(self):
+        self.trip()
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_trial_restarts_cooldown(self):
+        self.trip()
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+
+
+@override_settings(
+    S3_READ_RETRIES=1, S3_READ_CONNECT_TIMEOUT=0.5, S3_READ_TIMEOUT=1
+)
+class ReadObjectTests(TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(threshold=1, cooldown=0)
+        self.client = mock.Mock()
+        self.client.get_object.side_effect = EndpointConnectionError(
+            endpoint_url="https://s3"
+        )
+        for target, value in [
+            ("remote_report.storage.read_breaker", self.breaker),
+            ("remote_report.storage.report_bucket_name", lambda: "reports"),
+            ("remote_report.storage.s3_clients.get_client", lambda **kw: self.client),
+        ]:
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_retries_within_budget(self):
+        with self.assertRaises(StorageUnavailable):
+            read_object("reports/1.jpg", budget=5)
+
+        self.assertEqual(self.client.get_object.call_count, 2)
+
+    def test_skips_retry_that_cannot_fit_the_budget(self):
+        with self.assertRaises(StorageUnavailable):
+            read_object("reports/1.jpg", budget=1)
+
+        self.assertEqual(self.client.get_object.call_count, 1)
+
+    def test_setup_error_during_trial_does_not_wedge_breaker(self):
+        self.breaker.record_failure()
+
+        with mock.patch(
+            "remote_report.storage.report_bucket_name",
+            side_effect=RuntimeError("No S3 bucket configured"),
+        ), self.assertRaises(RuntimeError):
+            read_object("reports/1.jpg")
+
+        # The next read still gets the half-open trial
+        self.assertTrue(self.breaker.allow())
+
+    def test_unexpected_error_releases_trial(self):
+        self.breaker.record_failure()
+        self.client.get_object.side_effect = ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            read_object("reports/1.jpg")
+
+        self.assertTrue(self.breaker.allow())
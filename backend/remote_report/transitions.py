@@ -0,0 +1,160 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import IssueReportRemote
+from .summary import ISSUE_STATUSES
+
+# ---- STATE MACHINE ----
+ALLOWED_TRANSITIONS = {
+    "pending": ["in_progress"],
+    "in_progress": ["escalated", "resolved"],
+    "escalated": [],
+    "resolved": [],
+}
+
+TRANSITION_ERRORS = {
+    "pending": "Pending can only move to In Progress",
+    "in_progress": "In Progress can only move to Escalated or Resolved",
+}
+
+
+class TransitionError(Exception):
+    """
+    Raised when a status change is rejected. `code` is one of
+    "invalid", "not_found" or "conflict"; `current` is the issue's status
+    when it was read.
+    """
+
+    def __init__(self, code, detail, current=None):
+        super().__init__(detail)
+        self.code = code
+        self.detail = detail
+        self.current = current
+
+
+def source_statuses(new_status):
+    """
+    Statuses an issue may be in for it to move to `new_status`.
+    """
+    return [
+        current
+        for current, targets in ALLOWED_TRANSITIONS.items()
+        if new_status in targets
+    ]
+
+
+def concurrent_statuses(new_status):
+    """
+    Statuses another officer's legal transition could have just written
+    over a row this change to `new_status` was valid for. Finding one of
+    these after a failed compare-and-set means a lost race, not a bad
+    request.
+    """
+    statuses = {new_status}
+    for source in source_statuses(new_status):
+        statuses.update(ALLOWED_TRANSITIONS[source])
+    return statuses
+
+
+def transition_error(current, new_status):
+    """
+    Returns the state machine's rejection message, or None if allowed.
+    """
+    if new_status in ALLOWED_TRANSITIONS.get(current, []):
+        return None
+    return TRANSITION_ERRORS.get(current, f"{current} issues cannot change status")
+
+
+def transition_values(new_status, userid, now=None):
+    """
+    Column values written by a transition to `new_status`.
+    """
+    values = {"status": new_status, "updated_at": now or timezone.now()}
+    # Claiming a pending issue allocates it to the officer
+    if new_status == "in_progress":
+        values["allocated_to"] = str(userid)
+    return values
+
+
+def apply_transition(tracking_id, new_status, userid, department):
+    """
+    Moves one issue of `department` to `new_status` as a single
+    compare-and-set UPDATE.
+
+    The WHERE clause only matches rows whose current status may move to
+    `new_status`, so two officers racing on the same issue can't both
+    win. The row is only read again when the update matched nothing, to
+    tell a missing issue, a rejected transition and a lost race apart.
+    A race lost to a transition that leaves the issue where it can't
+    move is a conflict, but reported with the state machine's reason,
+    since retrying can't succeed.
+
+    Returns the column values that were written.
+    """
+    if new_status not in ISSUE_STATUSES:
+        raise TransitionError("invalid", "Invalid status")
+
+    values = transition_values(new_status, userid)
+    issue = IssueReportRemote.objects.filter(
+        tracking_id=tracking_id, department=department
+    )
+    updated = issue.filter(status__in=source_statuses(new_status)).update(**values)
+
+    if updated:
+        return values
+
+    current = issue.values_list("status", flat=True).first()
+    if current is None:
+        raise TransitionError("not_found", "Issue not found")
+
+    error = transition_error(current, new_status)
+    if error is None:
+        raise TransitionError(
+            "conflict", "Issue status changed concurrently, please retry", current
+        )
+    if current in concurrent_statuses(new_status):
+        raise TransitionError("conflict", error, current)
+
+    raise TransitionError("invalid", error, current)
+
+
+def apply_bulk_transition(tracking_ids, new_status, userid, department):
+    """
+    Moves many issues of `department` to `new_status` in one transaction.
+
+    The matching rows are locked and read in one SELECT, then every
+    eligible issue is moved by a single set-based UPDATE. Returns a dict
+    mapping each tracking ID to None on success or a (code, detail) pair.
+    """
+    if new_status not in ISSUE_STATUSES:
+        raise TransitionError("invalid", "Invalid status")
+
+    results = {}
+    with transaction.atomic():
+        current = dict(
+            IssueReportRemote.objects.select_for_update()
+            .filter(tracking_id__in=tracking_ids, department=department)
+            .order_by()
+            .values_list("tracking_id", "status")
+        )
+
+        eligible = []
+        for tracking_id in tracking_ids:
+            if tracking_id not in current:
+                results[tracking_id] = ("not_found", "Issue not found")
+                continue
+            error = transition_error(current[tracking_id], new_status)
+            if error:
+                results[tracking_id] = ("invalid", error)
+            else:
+                eligible.append(tracking_id)
+                results[tracking_id] = None
+
+        if eligible:
+            # Rows are locked, so the status guard is a belt-and-braces check
+            IssueReportRemote.objects.filter(
+                tracking_id__in=eligible,
+                status__in=source_statuses(new_status),
+            ).update(**transition_values(new_status, userid))
+
+    return results
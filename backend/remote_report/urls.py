@@ -5,10 +5,29 @@ from .views import (
     IssueResolveView,
     IssueStatusUpdateView,
     IssuePDFView,
+    IssueSummaryView,
+    IssueBulkStatusUpdateView,
+    IssueBatchDetailView,
+    IssuePDFPackView,
+    PDFRenderJobCreateView,
+    PDFRenderJobDetailView,
+    PDFRenderJobDownloadView,
+    IssueExportView,
+    IssueSearchView,
 )
 
 urlpatterns = [
     path("issues/", IssueListView.as_view(), name="issue-list"),
+    path("issues/summary/", IssueSummaryView.as_view(), name="issue-summary"),
+    path("issues/search/", IssueSearchView.as_view(), name="issue-search"),
+    path("issues/export/", IssueExportView.as_view(), name="issue-export"),
+    path("issues/batch/", IssueBatchDetailView.as_view(), name="issue-batch"),
+    path(
+        "issues/bulk-status/",
+        IssueBulkStatusUpdateView.as_view(),
+        name="issue-bulk-status",
+    ),
+    path("issues/pdf-pack/", IssuePDFPackView.as_view(), name="issue-pdf-pack"),
     path("issues/<str:tracking_id>/", IssueDetailView.as_view(), name="issue-detail"),
     path(
         "issues/<str:tracking_id>/status/",
@@ -25,4 +44,15 @@ urlpatterns = [
         IssuePDFView.as_view(),
         name="issue-pdf",
     ),
+    path("pdf-jobs/", PDFRenderJobCreateView.as_view(), name="pdf-job-create"),
+    path(
+        "pdf-jobs/<str:job_id>/",
+        PDFRenderJobDetailView.as_view(),
+        name="pdf-job-detail",
+    ),
+    path(
+        "pdf-jobs/<str:job_id>/download/",
+        PDFRenderJobDownloadView.as_view(),
+        name="pdf-job-download",
+    ),
 ]
@@ -1,38 +1,118 @@
+import tempfile
+from datetime import timedelta
+
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
-from .models import IssueReportRemote
-from .serializers import IssueReportSerializer
+from django.core.exceptions import ValidationError as DjangoValidationError
+from .models import IssueReportRemote, PDFRenderJob
+from .serializers import IssueReportSerializer, ISSUE_LIST_FIELDS
+from .pagination import IssueKeysetPagination
+from .fastjson import IssueRowEncoder, dumps, format_datetime
+from .summary import (
+    OPEN_STATUSES,
+    get_department_summary,
+    invalidate_department_summary,
+)
+from .transitions import (
+    TransitionError,
+    apply_bulk_transition,
+    apply_transition,
+)
+from .conditional import (
+    check_not_modified,
+    list_fingerprint,
+    make_etag,
+    presign_window,
+    set_validators,
+)
 from rest_framework import status
 from django.conf import settings
-import boto3
-from urllib.parse import urlparse, unquote
-from django.utils import timezone
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.graphics.barcode import qr
-from reportlab.graphics.shapes import Drawing
-from reportlab.lib.colors import HexColor
-from django.http import HttpResponse
-from io import BytesIO
-import requests
-import os
-
-#To generate Report PDF
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-    Spacer,
-    Image,
-    Table,
-    TableStyle,
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from admin_hub.admission import AdmissionControlMixin
+from admin_hub.singleflight import SingleFlight
+from .storage import generate_presigned_get
+from .pdf_cache import get_cached_issue_pdf
+from .pdf_pack import PACK_FORMATS, PdfWriter, build_pack, render_issue_pdfs
+from .pdf_jobs import submit_job
+from .search import search_issues, tokenize
+from .export import (
+    EXPORT_FORMATS,
+    export_rows,
+    iter_csv,
+    iter_ndjson,
+    pq,
+    write_parquet,
 )
 
+# Shares DB lookups and detail serialization between identical
+# concurrent requests in this process
+issue_flights = SingleFlight(wait_timeout=getattr(settings, "SINGLE_FLIGHT_WAIT", 30))
+
+PRESIGNED_FIELDS = {
+    "image_presigned_url": "image_url",
+    "completion_presigned_url": "completion_url",
+}
+
+
+def parse_requested_fields(request, allowed):
+    """
+    Reads the `?fields=a,b,c` sparse fieldset parameter.
+
+    Returns None when the parameter is absent, otherwise the requested
+    field names in the order given.
+    """
+    raw = request.query_params.get("fields")
+    if raw is None:
+        return None
+
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    if not fields:
+        raise ValidationError("fields must not be empty")
+
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+
+    return fields
+
+
+def detail_queryset(fields):
+    """
+    Issues queryset loading the columns a detail response needs.
+    """
+    issues = IssueReportRemote.objects.all()
+    if fields is not None:
+        columns = {f for f in fields if f not in PRESIGNED_FIELDS}
+        columns |= {PRESIGNED_FIELDS[f] for f in fields if f in PRESIGNED_FIELDS}
+        issues = issues.only(*columns, "tracking_id", "department", "updated_at")
+    return issues
+
+
+def serialize_issue_detail(issue, fields=None):
+    if fields is None:
+        data = IssueReportSerializer(issue).data
+        presigned = PRESIGNED_FIELDS
+    else:
+        data = IssueReportSerializer(issue, fields=fields).data
+        presigned = {
+            k: v for k, v in PRESIGNED_FIELDS.items() if k in fields
+        }
+
+    # Only sign the objects the caller asked for; signing goes through the
+    # shared client and presigned URL cache
+    for presigned_field, source in presigned.items():
+        value = getattr(issue, source)
+        data[presigned_field] = (
+            generate_presigned_get(value) if value else None
+        )
+
+    return data
+
+
 class IssueListView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -40,26 +120,136 @@ class IssueListView(APIView):
         user = request.user
         status = request.GET.get("status")
 
+        fields = (
+            parse_requested_fields(request, IssueReportSerializer.Meta.fields)
+            or ISSUE_LIST_FIELDS
+        )
+
         issues = IssueReportRemote.objects.filter(
             department=user.department
         )
 
+        updated_since = request.query_params.get("updated_since")
+        if updated_since:
+            statuses = [status] if status else ["pending", "in_progress"]
+            return self.get_delta(issues, statuses, fields, updated_since)
+
         if status:
             issues = issues.filter(status=status)
         else:
             issues = issues.filter(status__in = ["pending","in_progress"])
 
-        issues = issues.order_by("-issue_date")
+        issues = issues.order_by("-issue_date", "-id")
+
+        # Fast path: values_list tuples straight to JSON bytes
+        encoder = IssueRowEncoder(fields)
+        rows = issues.values_list(*encoder.columns)
 
-        serializer = IssueReportSerializer(issues, many=True)
-        return Response(serializer.data)
+        paginator = IssueKeysetPagination()
+        if paginator.is_requested(request):
+            # No fingerprint here: it would scan the whole bucket and undo
+            # the flat per-page cost of keyset pagination
+            page = paginator.paginate_queryset(
+                rows, request, view=self, position=encoder.position
+            )
+            return HttpResponse(
+                encoder.encode_page(page, paginator.next_cursor),
+                content_type="application/json",
+            )
+
+        # Answer polling clients from a single aggregate query when possible.
+        # No Last-Modified: the newest updated_at doesn't move when a row
+        # leaves the bucket, so If-Modified-Since would get a stale 304.
+        latest, total = list_fingerprint(issues)
+        etag = make_etag(user.department, status, ",".join(fields), latest, total)
+        not_modified = check_not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = HttpResponse(
+            encoder.encode(rows.iterator(chunk_size=2000)),
+            content_type="application/json",
+        )
+        return set_validators(response, etag)
+
+    def get_delta(self, issues, statuses, fields, updated_since):
+        """
+        Delta sync: rows of the department touched after `updated_since`.
+
+        Changed rows still in the requested status bucket are returned in
+        full; the tracking IDs of rows that moved out of it are listed in
+        `removed`. The client stores `watermark` for its next call. When
+        more than ISSUE_DELTA_LIMIT rows changed, `reset` tells the client
+        to reload the bucket instead.
+
+        `updated_at` is stamped before the write commits, so a row can
+        become visible after a later-stamped one was already returned.
+        The watermark therefore trails the clock by ISSUE_DELTA_GRACE
+        seconds, and rows changed within that window are sent again on
+        the next call.
+        """
+        since = parse_datetime(updated_since)
+        if since is None:
+            raise ValidationError("updated_since must be an ISO 8601 datetime")
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+
+        limit = getattr(settings, "ISSUE_DELTA_LIMIT", 1000)
+        encoder = IssueRowEncoder(fields)
+
+        # One query covers both buckets; status and tracking_id ride along
+        # after the encoder's columns and are dropped from the output
+        rows = list(
+            issues.filter(updated_at__gt=since)
+            .order_by("updated_at", "id")
+            .values_list(*encoder.columns, "status", "tracking_id", "updated_at")[
+                : limit + 1
+            ]
+        )
+
+        if len(rows) > limit:
+            content = dumps(
+                {"reset": True, "results": [], "removed": [], "watermark": None}
+            )
+            return HttpResponse(content, content_type="application/json")
+
+        changed, removed = [], []
+        for row in rows:
+            row_status, tracking_id = row[-3], row[-2]
+            if row_status in statuses:
+                changed.append(row)
+            else:
+                removed.append(tracking_id)
+
+        watermark = rows[-1][-1] if rows else since
+        grace = timedelta(seconds=getattr(settings, "ISSUE_DELTA_GRACE", 30))
+        watermark = min(watermark, timezone.now() - grace)
+
+        content = dumps(
+            {
+                "reset": False,
+                "results": encoder.to_dicts(changed),
+                "removed": removed,
+                "watermark": format_datetime(watermark),
+            }
+        )
+        return HttpResponse(content, content_type="application/json")
     
 class IssueDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, tracking_id):
+        fields = parse_requested_fields(
+            request, [*IssueReportSerializer.Meta.fields, *PRESIGNED_FIELDS]
+        )
+
+        issues = detail_queryset(fields)
+
         try:
-            issue = IssueReportRemote.objects.get(tracking_id=tracking_id)
+            issue = issue_flights.do(
+                ("issue", tracking_id, tuple(fields or ())),
+                lambda: issues.get(tracking_id=tracking_id),
+            )
         except IssueReportRemote.DoesNotExist:
             raise NotFound("Issue not found")
 
@@ -67,67 +257,290 @@ class IssueDetailView(APIView):
         if issue.department != request.user.department:
             raise PermissionDenied("You do not have access to this issue")
 
-        data = IssueReportSerializer(issue).data
+        wants_presigned = fields is None or any(
+            f in PRESIGNED_FIELDS for f in fields
+        )
+        etag = make_etag(
+            issue.tracking_id,
+            issue.updated_at,
+            ",".join(fields or []),
+            presign_window() if wants_presigned else "",
+        )
+        # Last-Modified alone can't express presigned URL expiry, so bodies
+        # carrying signed links are validated by ETag only
+        last_modified = None if wants_presigned else issue.updated_at
+        not_modified = check_not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        # The ETag already covers tracking_id, updated_at, fields and the
+        # presign window, so it identifies identical concurrent requests
+        data = issue_flights.do(
+            ("detail", etag), lambda: serialize_issue_detail(issue, fields)
+        )
+        return set_validators(Response(data), etag, last_modified)
 
-        data["image_presigned_url"] = (
-            generate_presigned_get(data["image_url"])
-            if data.get("image_url")
-            else None
+
+class IssueBatchDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        fields = parse_requested_fields(
+            request, [*IssueReportSerializer.Meta.fields, *PRESIGNED_FIELDS]
         )
+        tracking_ids = request.data.get("tracking_ids")
+
+        if not isinstance(tracking_ids, list) or not tracking_ids:
+            raise ValidationError("tracking_ids must be a non-empty list")
+
+        tracking_ids = list(dict.fromkeys(str(t) for t in tracking_ids))
+
+        limit = getattr(settings, "ISSUE_BATCH_LIMIT", 100)
+        if len(tracking_ids) > limit:
+            raise ValidationError(f"At most {limit} issues per request")
+
+        # Scoped to the caller's department in the query itself; issues of
+        # other departments are reported as missing, like unknown IDs
+        issues = {
+            issue.tracking_id: issue
+            for issue in detail_queryset(fields).filter(
+                tracking_id__in=tracking_ids,
+                department=request.user.department,
+            )
+        }
+
+        results = [
+            serialize_issue_detail(issues[t], fields)
+            for t in tracking_ids
+            if t in issues
+        ]
+        missing = [t for t in tracking_ids if t not in issues]
 
-        data["completion_presigned_url"] = (
-            generate_presigned_get(data["completion_url"])
-            if data.get("completion_url")
-            else None
+        return Response({"results": results, "missing": missing})
+
+
+class IssueSearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not tokenize(query):
+            raise ValidationError("q must contain at least one search term")
+
+        fields = (
+            parse_requested_fields(request, IssueReportSerializer.Meta.fields)
+            or ISSUE_LIST_FIELDS
         )
 
+        try:
+            page = int(request.query_params.get("page", 1))
+            page_size = int(
+                request.query_params.get(
+                    "page_size", getattr(settings, "ISSUE_PAGE_SIZE", 50)
+                )
+            )
+        except ValueError:
+            raise ValidationError("page and page_size must be integers")
+        if page < 1 or page_size < 1:
+            raise ValidationError("page and page_size must be positive")
+        page_size = min(page_size, getattr(settings, "ISSUE_MAX_PAGE_SIZE", 200))
+
+        # Ranking cost grows with depth, so only the top results are paged
+        offset = (page - 1) * page_size
+        if offset >= getattr(settings, "ISSUE_SEARCH_MAX_RESULTS", 1000):
+            raise ValidationError("Refine the search to see more results")
+
+        department = request.user.department
+        # One extra hit tells whether another page exists
+        hits = search_issues(
+            query,
+            department,
+            status=request.query_params.get("status"),
+            offset=offset,
+            limit=page_size + 1,
+        )
+        has_next = len(hits) > page_size
+        hits = hits[:page_size]
+
+        encoder = IssueRowEncoder(fields)
+        rows = {
+            row[encoder.columns.index("id")]: row
+            for row in IssueReportRemote.objects.filter(
+                id__in=[pk for pk, _ in hits], department=department
+            ).values_list(*encoder.columns)
+        }
+        ranked = [(rows[pk], score) for pk, score in hits if pk in rows]
 
-        return Response(data)
+        results = encoder.to_dicts(row for row, _ in ranked)
+        for result, (_, score) in zip(results, ranked):
+            result["score"] = round(float(score), 4)
+
+        content = dumps(
+            {
+                "results": results,
+                "page": page,
+                "next_page": page + 1 if has_next else None,
+            }
+        )
+        return HttpResponse(content, content_type="application/json")
+
+
+class IssueExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # `format` is reserved by DRF for renderer selection
+        fmt = request.query_params.get("file_format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError(
+                f"file_format must be one of {', '.join(EXPORT_FORMATS)}"
+            )
+        if fmt == "parquet" and pq is None:
+            raise ValidationError("Parquet export is unavailable")
+
+        issues = IssueReportRemote.objects.filter(
+            department=request.user.department
+        )
+        issue_status = request.query_params.get("status")
+        if issue_status:
+            issues = issues.filter(status=issue_status)
+
+        rows = export_rows(
+            issues, chunk_size=getattr(settings, "ISSUE_EXPORT_CHUNK_SIZE", 2000)
+        )
+        content_type, extension = EXPORT_FORMATS[fmt]
+        filename = f"issues_{timezone.now():%Y%m%d_%H%M%S}.{extension}"
+
+        if fmt == "parquet":
+            # Parquet needs a seekable sink; spool it and stream the file
+            spool = tempfile.SpooledTemporaryFile(
+                max_size=getattr(settings, "ISSUE_EXPORT_SPOOL_BYTES", 8 * 1024 * 1024)
+            )
+            write_parquet(rows, spool)
+            spool.seek(0)
+            return FileResponse(
+                spool,
+                as_attachment=True,
+                filename=filename,
+                content_type=content_type,
+            )
+
+        stream = iter_csv(rows) if fmt == "csv" else iter_ndjson(rows)
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class IssueSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        summary = get_department_summary(request.user.department)
+        counts = summary["counts"]
+        oldest = summary["oldest_open_issue_date"]
+
+        return Response(
+            {
+                "department": request.user.department,
+                "counts": counts,
+                "total": sum(counts.values()),
+                "open": sum(counts[s] for s in OPEN_STATUSES),
+                "oldest_open_issue_date": oldest,
+                "oldest_open_age_seconds": (
+                    int((timezone.now() - oldest).total_seconds())
+                    if oldest
+                    else None
+                ),
+            }
+        )
+
+
+TRANSITION_ERROR_STATUS = {
+    "invalid": status.HTTP_400_BAD_REQUEST,
+    "not_found": status.HTTP_404_NOT_FOUND,
+    "conflict": status.HTTP_409_CONFLICT,
+}
 
 
 class IssueStatusUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def patch(self, request, tracking_id):
-        issue = get_object_or_404(IssueReportRemote, tracking_id=tracking_id)
         new_status = request.data.get("status")
 
-        if new_status not in ["pending", "in_progress", "escalated", "resolved"]:
-            return Response(
-                {"detail": "Invalid status"},
-                status=status.HTTP_400_BAD_REQUEST,
+        try:
+            values = apply_transition(
+                tracking_id,
+                new_status,
+                request.user.userid,
+                request.user.department,
             )
+        except TransitionError as e:
+            body = {"detail": e.detail}
+            if e.current:
+                body["status"] = e.current
+            return Response(body, status=TRANSITION_ERROR_STATUS[e.code])
 
-        current = issue.status
+        invalidate_department_summary(request.user.department)
 
-        # ---- STATE MACHINE ----
-        if current == "pending":
-            if new_status != "in_progress":
-                return Response(
-                    {"detail": "Pending can only move to In Progress"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            issue.allocated_to = str(request.user.userid)
+        # allocated_to is only reported when this transition wrote it
+        return Response(
+            {k: v for k, v in values.items() if k in ("status", "allocated_to")}
+        )
 
-        elif current == "in_progress":
-            if new_status not in ["escalated", "resolved"]:
-                return Response(
-                    {"detail": "In Progress can only move to Escalated or Resolved"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
 
-        elif current in ["escalated", "resolved"]:
+class IssueBulkStatusUpdateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        new_status = request.data.get("status")
+        tracking_ids = request.data.get("tracking_ids")
+
+        if not isinstance(tracking_ids, list) or not tracking_ids:
+            raise ValidationError("tracking_ids must be a non-empty list")
+
+        # Keep the caller's order, drop duplicates
+        tracking_ids = list(dict.fromkeys(str(t) for t in tracking_ids))
+
+        limit = getattr(settings, "ISSUE_BULK_LIMIT", 500)
+        if len(tracking_ids) > limit:
+            raise ValidationError(f"At most {limit} issues per request")
+
+        try:
+            outcome = apply_bulk_transition(
+                tracking_ids,
+                new_status,
+                request.user.userid,
+                request.user.department,
+            )
+        except TransitionError as e:
             return Response(
-                {"detail": f"{current} issues cannot change status"},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"detail": e.detail},
+                status=TRANSITION_ERROR_STATUS[e.code],
             )
 
-        issue.status = new_status
-        issue.updated_at = timezone.now()
-        issue.save()
+        results = []
+        for tracking_id in tracking_ids:
+            error = outcome[tracking_id]
+            if error is None:
+                results.append({"tracking_id": tracking_id, "ok": True})
+            else:
+                code, detail = error
+                results.append(
+                    {
+                        "tracking_id": tracking_id,
+                        "ok": False,
+                        "error": code,
+                        "detail": detail,
+                    }
+                )
+
+        updated = sum(1 for r in results if r["ok"])
+        if updated:
+            invalidate_department_summary(request.user.department)
 
         return Response(
-            {"status": issue.status, "allocated_to": issue.allocated_to}
+            {"status": new_status, "updated": updated, "results": results}
         )
 
 
@@ -163,6 +576,7 @@ class IssueResolveView(APIView):
         issue.updated_at = timezone.now()
 
         issue.save(update_fields=["status", "completion_url", "updated_at"])
+        invalidate_department_summary(issue.department)
 
         return Response(
             {
@@ -176,438 +590,148 @@ class IssueResolveView(APIView):
 
 
 
-def extract_s3_key(value: str) -> str:
-    """
-    Accepts either:
-    - raw S3 key: reports/6/file.jpg
-    - full S3 URL (encoded or not)
+class IssuePDFView(AdmissionControlMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    admission_pool = "pdf"
 
-    Returns:
-    - clean S3 object key
-    """
-    if not value:
-        return None
+    def get(self, request, tracking_id):
+        try:
+            issue = issue_flights.do(
+                ("issue", tracking_id, ()),
+                lambda: IssueReportRemote.objects.get(tracking_id=tracking_id),
+            )
+        except IssueReportRemote.DoesNotExist:
+            raise NotFound("Issue not found")
 
-    # Case 1: Already a key
-    if not value.startswith("http"):
-        return value
-
-    # Case 2: Full S3 URL
-    parsed = urlparse(value)
-
-    # Remove leading slash and decode %2F etc
-    return unquote(parsed.path.lstrip("/"))
-def get_s3_client():
-    return boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=(
-            getattr(settings, "AWS_REGION", None)
-            or getattr(settings, "AWS_S3_REGION_NAME", None)
-            or "ap-south-1"
-        ),
-    )
+        if issue.department != request.user.department:
+            raise PermissionDenied("Access denied")
 
+        # Coalesced on (tracking_id, updated_at) inside the PDF cache
+        pdf = get_cached_issue_pdf(issue)
 
-def generate_presigned_get(value, expires_in=300):
-    key = extract_s3_key(value)
-    if not key:
-        return None
+        response = HttpResponse(pdf, content_type="application/pdf")
+        response["Content-Disposition"] = (
+            f'attachment; filename="issue_{issue.tracking_id}.pdf"'
+        )
+        return response
 
-    bucket_name = (
-        getattr(settings, "REPORT_IMAGES_BUCKET", None)
-        or getattr(settings, "AWS_STORAGE_BUCKET_NAME", None)
-    )
 
-    if not bucket_name:
-        raise RuntimeError("No S3 bucket configured")
+def select_pack_issues(request):
+    """
+    Resolves a pack request body (tracking_ids or status, plus format)
+    to the caller's department issues, in pack order.
+    """
+    tracking_ids = request.data.get("tracking_ids")
+    issue_status = request.data.get("status")
+    fmt = request.data.get("format", "pdf")
 
-    s3 = get_s3_client()
+    if fmt not in PACK_FORMATS:
+        raise ValidationError(f"format must be one of {', '.join(PACK_FORMATS)}")
+    if fmt == "pdf" and PdfWriter is None:
+        raise ValidationError("Merged PDF packs are unavailable, use format=zip")
 
-    return s3.generate_presigned_url(
-        "get_object",
-        Params={
-            "Bucket": bucket_name,
-            "Key": key,
-        },
-        ExpiresIn=expires_in,
+    issues = IssueReportRemote.objects.filter(
+        department=request.user.department
     )
 
-def draw_header_footer(canvas, doc):
-    canvas.saveState()
-
-    PAGE_WIDTH, PAGE_HEIGHT = A4
-    HEADER_HEIGHT = 70
-    header_y = PAGE_HEIGHT - HEADER_HEIGHT
+    if tracking_ids:
+        if not isinstance(tracking_ids, list):
+            raise ValidationError("tracking_ids must be a list")
+        tracking_ids = list(dict.fromkeys(str(t) for t in tracking_ids))
+        issues = issues.filter(tracking_id__in=tracking_ids)
+    elif issue_status:
+        issues = issues.filter(status=issue_status)
+    else:
+        raise ValidationError("tracking_ids or status is required")
 
-    #Header Bg
-    canvas.setFillColor(colors.black)
-    canvas.rect(0, header_y, PAGE_WIDTH, HEADER_HEIGHT, stroke=0, fill=1)
+    limit = getattr(settings, "PDF_PACK_LIMIT", 50)
+    issues = list(issues.order_by("issue_date", "id")[: limit + 1])
+    if len(issues) > limit:
+        raise ValidationError(f"At most {limit} issues per pack")
+    if not issues:
+        raise NotFound("No matching issues")
 
-    #Logo
-    assets_path = os.path.join(os.path.dirname(__file__), "..", "assets")
-    logo_path = os.path.join(assets_path, "logo-1.png")
+    if tracking_ids:
+        # Keep the order the caller asked for
+        position = {t: n for n, t in enumerate(tracking_ids)}
+        issues.sort(key=lambda issue: position[issue.tracking_id])
 
-    try:
-        canvas.drawImage(
-            logo_path,
-            40,
-            header_y + 20,
-            width=35,
-            height=35,
-            preserveAspectRatio=True,
-            mask="auto",
-        )
-    except Exception:
-        pass
-
-    canvas.setFillColor(colors.white)
-    canvas.setFont("Helvetica-Bold", 18)
-    canvas.drawString(85, header_y + 38, "ReportMitra")
-
-    canvas.setFont("Helvetica", 9)
-    canvas.setFillColor(HexColor("#D1D5DB"))
-    canvas.drawString(85, header_y + 22, "CIVIC | CONNECT | RESOLVE")
-
-    #DocTitle
-    canvas.setFillColor(colors.white)
-    canvas.setFont("Helvetica-Bold", 12)
-    text = "Issue Field Briefing Report"
-    text_width = canvas.stringWidth(text, "Helvetica-Bold", 12)
-    canvas.drawString(PAGE_WIDTH - text_width - 40, header_y + 32, text)
-
-    #Footer
-    canvas.setFillColor(HexColor("#6B7280"))
-    canvas.setFont("Helvetica", 8)
-    canvas.drawString(40, 35, f"Page {doc.page}")
-    
-    footer_text = "Generated from ReportMitra Admin Portal"
-    footer_width = canvas.stringWidth(footer_text, "Helvetica", 8)
-    canvas.drawString(PAGE_WIDTH - footer_width - 40, 35, footer_text)
+    return issues, fmt
 
-    canvas.restoreState()
 
-class IssuePDFView(APIView):
+class IssuePDFPackView(AdmissionControlMixin, APIView):
     permission_classes = [IsAuthenticated]
+    admission_pool = "pdf-pack"
 
-    def get(self, request, tracking_id):
-        try:
-            issue = IssueReportRemote.objects.get(tracking_id=tracking_id)
-        except IssueReportRemote.DoesNotExist:
-            raise NotFound("Issue not found")
+    def post(self, request):
+        issues, fmt = select_pack_issues(request)
 
-        if issue.department != request.user.department:
-            raise PermissionDenied("Access denied")
-
-        buffer = BytesIO()
+        pdfs = render_issue_pdfs(issues)
+        pack = build_pack(issues, pdfs, fmt)
 
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=40,
-            leftMargin=40,
-            topMargin=90,
-            bottomMargin=65,
+        return FileResponse(
+            pack,
+            as_attachment=True,
+            filename=f"briefing_pack.{fmt}",
+            content_type="application/pdf" if fmt == "pdf" else "application/zip",
         )
 
-        section_header = ParagraphStyle(
-            "SectionHeader",
-            fontSize=13,
-            fontName="Helvetica-Bold",
-            textColor=colors.black,
-            spaceBefore=18,
-            spaceAfter=10,
-            leftIndent=0,
-        )
 
-        body_text = ParagraphStyle(
-            "BodyText",
-            fontSize=10,
-            leading=14,
-            textColor=HexColor("#374151"),
+def get_department_job(request, job_id):
+    try:
+        return PDFRenderJob.objects.get(
+            job_id=job_id, department=request.user.department
         )
+    except (PDFRenderJob.DoesNotExist, DjangoValidationError):
+        raise NotFound("Job not found")
 
-        subtitle = ParagraphStyle(
-            "Subtitle",
-            fontSize=9,
-            textColor=HexColor("#6B7280"),
-            spaceAfter=16,
-            leading=13,
-        )
 
-        story = []
+def serialize_job(job):
+    return {
+        "job_id": str(job.job_id),
+        "status": job.status,
+        "format": job.format,
+        "tracking_ids": job.tracking_ids,
+        "error": job.error or None,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
 
-        story.append(
-            Paragraph(
-                "This document assists on-site municipal workers with issue verification, "
-                "safety assessment, and resolution procedures.",
-                subtitle,
-            )
-        )
 
-        status_colors = {
-            "pending": ("#FEF3C7", "#92400E"),
-            "in_progress": ("#DBEAFE", "#1E40AF"),
-            "escalated": ("#FEE2E2", "#991B1B"),
-            "resolved": ("#D1FAE5", "#065F46"),
-        }
-        bg_color, text_color = status_colors.get(
-            issue.status, ("#F3F4F6", "#1F2937")
-        )
-
-        story.append(Paragraph("Issue Overview", section_header))
-
-        overview_data = [
-            [
-                Paragraph("<b>Tracking ID</b>", body_text),
-                Paragraph(issue.tracking_id, body_text),
-            ],
-            [
-                Paragraph("<b>Status</b>", body_text),
-                Paragraph(
-                    f'<para backColor="{bg_color}" textColor="{text_color}" '
-                    f'fontSize="9" fontName="Helvetica-Bold">'
-                    f'&nbsp;&nbsp;{issue.status.upper()}&nbsp;&nbsp;</para>',
-                    body_text,
-                ),
-            ],
-            [
-                Paragraph("<b>Department</b>", body_text),
-                Paragraph(issue.department, body_text),
-            ],
-            [
-                Paragraph("<b>Location</b>", body_text),
-                Paragraph(issue.location, body_text),
-            ],
-            [
-                Paragraph("<b>Reported On</b>", body_text),
-                Paragraph(
-                    issue.issue_date.strftime("%d %B %Y, %I:%M %p"), body_text
-                ),
-            ],
-        ]
-
-        overview_table = Table(overview_data, colWidths=[130, 355])
-        overview_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (0, -1), HexColor("#F9FAFB")),
-                    ("GRID", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-                    ("TOPPADDING", (0, 0), (-1, -1), 8),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-                ]
-            )
-        )
-        story.append(overview_table)
-        story.append(Spacer(1, 16))
-
-        story.append(Paragraph("Issue Title", section_header))
-        title_box = Table(
-            [[Paragraph(issue.issue_title, body_text)]], colWidths=[485]
-        )
-        title_box.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), HexColor("#F9FAFB")),
-                    ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-                    ("TOPPADDING", (0, 0), (-1, -1), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-                ]
-            )
-        )
-        story.append(title_box)
+class PDFRenderJobCreateView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        story.append(Paragraph("Issue Description", section_header))
-        desc_box = Table(
-            [[Paragraph(issue.issue_description.replace("\n", "<br/>"), body_text)]],
-            colWidths=[485],
-        )
-        desc_box.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), HexColor("#F9FAFB")),
-                    ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-                    ("TOPPADDING", (0, 0), (-1, -1), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-                ]
-            )
-        )
-        story.append(desc_box)
+    def post(self, request):
+        issues, fmt = select_pack_issues(request)
+        job = submit_job(request.user, issues, fmt)
+        return Response(serialize_job(job), status=status.HTTP_202_ACCEPTED)
 
-        story.append(Paragraph("Issue Image (On-site Reference)", section_header))
 
-        if issue.image_url:
-            try:
-                presigned_url = generate_presigned_get(issue.image_url)
-                img_resp = requests.get(presigned_url, timeout=5)
-                img_resp.raise_for_status()
+class PDFRenderJobDetailView(APIView):
+    permission_classes = [IsAuthenticated]
 
-                img = Image(
-                    BytesIO(img_resp.content),
-                    width=4.5 * inch,
-                    height=3 * inch,
-                    kind="proportional",
-                )
+    def get(self, request, job_id):
+        job = get_department_job(request, job_id)
+        return Response(serialize_job(job))
 
-                img_table = Table([[img]], colWidths=[485])
-                img_table.setStyle(
-                    TableStyle(
-                        [
-                            ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
-                            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                            ("LEFTPADDING", (0, 0), (-1, -1), 10),
-                            ("RIGHTPADDING", (0, 0), (-1, -1), 10),
-                            ("TOPPADDING", (0, 0), (-1, -1), 10),
-                            ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-                            ("BACKGROUND", (0, 0), (-1, -1), colors.white),
-                        ]
-                    )
-                )
-                story.append(img_table)
-            except Exception as e:
-                error_box = Table(
-                    [[Paragraph("Image unavailable", body_text)]], colWidths=[485]
-                )
-                error_box.setStyle(
-                    TableStyle(
-                        [
-                            ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
-                            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                            ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                            ("TOPPADDING", (0, 0), (-1, -1), 20),
-                            ("BOTTOMPADDING", (0, 0), (-1, -1), 20),
-                        ]
-                    )
-                )
-                story.append(error_box)
-        else:
-            no_img_box = Table(
-                [[Paragraph("No image attached", body_text)]], colWidths=[485]
-            )
-            no_img_box.setStyle(
-                TableStyle(
-                    [
-                        ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
-                        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                        ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                        ("TOPPADDING", (0, 0), (-1, -1), 20),
-                        ("BOTTOMPADDING", (0, 0), (-1, -1), 20),
-                    ]
-                )
-            )
-            story.append(no_img_box)
 
-        story.append(Paragraph("Allocated To (Fill On-Site)", section_header))
+class PDFRenderJobDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        allocation_box = Table(
-            [[""], [""], [""]],
-            colWidths=[485],
-            rowHeights=[25, 25, 25],
-        )
-        allocation_box.setStyle(
-            TableStyle(
-                [
-                    ("BOX", (0, 0), (-1, -1), 1, colors.black),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.5, HexColor("#D1D5DB")),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 8),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-                ]
-            )
-        )
-        story.append(allocation_box)
-
-        #QR Code
-        story.append(Paragraph("Quick Access QR Code", section_header))
-
-        qr_url = f"https://reportmitra.in/admin/issues/{issue.tracking_id}"
-        qr_code = qr.QrCodeWidget(qr_url)
-        bounds = qr_code.getBounds()
-        width = bounds[2] - bounds[0]
-        height = bounds[3] - bounds[1]
-        d = Drawing(100, 100, transform=[100.0 / width, 0, 0, 100.0 / height, 0, 0])
-        d.add(qr_code)
-
-        qr_table = Table([[d]], colWidths=[485])
-        qr_table.setStyle(
-            TableStyle(
-                [
-                    ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#E5E7EB")),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("TOPPADDING", (0, 0), (-1, -1), 15),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 15),
-                ]
-            )
-        )
-        story.append(qr_table)
-
-        story.append(Spacer(1, 8))
-        story.append(
-            Paragraph(
-                "<i>Scan to view issue details on ReportMitra Admin Portal</i>",
-                ParagraphStyle(
-                    "QRCaption",
-                    fontSize=9,
-                    textColor=HexColor("#6B7280"),
-                    alignment=1,
-                ),
-            )
-        )
+    def get(self, request, job_id):
+        job = get_department_job(request, job_id)
 
-        #Document Authenticity
-        story.append(Spacer(1, 25))
-        auth_box = Table(
-            [
-                [
-                    Paragraph(
-                        "<b>Official Document</b><br/>"
-                        "This is an official municipal record generated digitally "
-                        "by ReportMitra Admin Portal.",
-                        ParagraphStyle(
-                            "Auth",
-                            fontSize=9,
-                            textColor=HexColor("#374151"),
-                            leading=12,
-                        ),
-                    )
-                ]
-            ],
-            colWidths=[485],
-        )
-        auth_box.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), HexColor("#F3F4F6")),
-                    ("BOX", (0, 0), (-1, -1), 0.5, HexColor("#D1D5DB")),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-                    ("TOPPADDING", (0, 0), (-1, -1), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-                ]
+        if job.status != "done" or not job.result:
+            return Response(
+                {"detail": f"Job is {job.status}"},
+                status=status.HTTP_409_CONFLICT,
             )
-        )
-        story.append(auth_box)
-
-        #Build PDF
-        doc.build(
-            story,
-            onFirstPage=draw_header_footer,
-            onLaterPages=draw_header_footer,
-        )
 
-        buffer.seek(0)
-
-        response = HttpResponse(buffer, content_type="application/pdf")
-        response["Content-Disposition"] = (
-            f'attachment; filename="issue_{issue.tracking_id}.pdf"'
+        return FileResponse(
+            job.result.open("rb"),
+            as_attachment=True,
+            filename=f"briefing_{job.job_id}.{job.format}",
+            content_type=(
+                "application/pdf" if job.format == "pdf" else "application/zip"
+            ),
         )
-        return response
\ No newline at end of file
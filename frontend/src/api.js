@@ -80,8 +80,22 @@ export async function getCurrentUser() {
   return res.json();
 }
 
-export async function getIssues(status = null) {
-  const qs = status && status !== "all" ? `?status=${status}` : "";
+export async function logout() {
+  // Best effort: the audit entry shouldn't block signing out
+  try {
+    await fetchWithAuth(`${API_V1}/logout/`, { method: "POST" });
+  } catch {
+    // ignore
+  }
+  clearTokens();
+}
+
+export async function getIssues(status = null, { cursor, pageSize } = {}) {
+  const params = new URLSearchParams();
+  if (status && status !== "all") params.set("status", status);
+  if (cursor) params.set("cursor", cursor);
+  if (pageSize) params.set("page_size", String(pageSize));
+  const qs = params.toString() ? `?${params.toString()}` : "";
 
   const res = await fetchWithAuth(
     `${API_BASE}/restapi/issues/${qs}`,
@@ -96,6 +110,20 @@ export async function getIssues(status = null) {
   return res.json();
 }
 
+export async function getIssueSummary() {
+  const res = await fetchWithAuth(
+    `${API_BASE}/restapi/issues/summary/`,
+    { method: "GET" }
+  );
+
+  if (!res.ok) {
+    const text = await res.text().catch(() => "");
+    throw new Error(`getIssueSummary failed: ${res.status} ${text}`);
+  }
+
+  return res.json();
+}
+
 export async function getIssueDetail(trackingId) {
   const res = await fetchWithAuth(
     `${API_BASE}/restapi/issues/${trackingId}/`,
@@ -110,6 +138,24 @@ export async function getIssueDetail(trackingId) {
   return res.json();
 }
 
+export async function getIssueDetails(trackingIds) {
+  const res = await fetchWithAuth(
+    `${API_BASE}/restapi/issues/batch/`,
+    {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ tracking_ids: trackingIds }),
+    }
+  );
+
+  if (!res.ok) {
+    const text = await res.text().catch(() => "");
+    throw new Error(`getIssueDetails failed: ${res.status} ${text}`);
+  }
+
+  return res.json();
+}
+
 export async function getPresignedUpload(file) {
   const res = await fetchWithAuth(`${API_BASE}/api/presign-s3/`, {
     method: "POST",
@@ -156,6 +202,24 @@ export async function updateIssueStatus(trackingId, status) {
   return res.json();
 }
 
+export async function bulkUpdateIssueStatus(trackingIds, status) {
+  const res = await fetchWithAuth(
+    `${API_BASE}/restapi/issues/bulk-status/`,
+    {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ tracking_ids: trackingIds, status }),
+    }
+  );
+
+  if (!res.ok) {
+    const text = await res.text().catch(() => "");
+    throw new Error(`bulkUpdateIssueStatus failed: ${res.status} ${text}`);
+  }
+
+  return res.json();
+}
+
 export async function downloadIssuePDF(trackingId) {
   const token = localStorage.getItem(ACCESS_KEY);
 
@@ -176,6 +240,64 @@ export async function downloadIssuePDF(trackingId) {
   return response.blob();
 }
 
+export async function downloadIssuePack({ trackingIds, status, format = "pdf" }) {
+  const res = await fetchWithAuth(
+    `${API_BASE}/restapi/issues/pdf-pack/`,
+    {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ tracking_ids: trackingIds, status, format }),
+    }
+  );
+
+  if (!res.ok) {
+    throw new Error("Failed to download briefing pack");
+  }
+
+  return res.blob();
+}
+
+export async function submitPdfJob({ trackingIds, status, format = "pdf" }) {
+  const res = await fetchWithAuth(`${API_BASE}/restapi/pdf-jobs/`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ tracking_ids: trackingIds, status, format }),
+  });
+
+  if (!res.ok) {
+    const text = await res.text().catch(() => "");
+    throw new Error(`submitPdfJob failed: ${res.status} ${text}`);
+  }
+
+  return res.json();
+}
+
+export async function getPdfJob(jobId) {
+  const res = await fetchWithAuth(`${API_BASE}/restapi/pdf-jobs/${jobId}/`, {
+    method: "GET",
+  });
+
+  if (!res.ok) {
+    const text = await res.text().catch(() => "");
+    throw new Error(`getPdfJob failed: ${res.status} ${text}`);
+  }
+
+  return res.json();
+}
+
+export async function downloadPdfJob(jobId) {
+  const res = await fetchWithAuth(
+    `${API_BASE}/restapi/pdf-jobs/${jobId}/download/`,
+    { method: "GET" }
+  );
+
+  if (!res.ok) {
+    throw new Error("Failed to download PDF job result");
+  }
+
+  return res.blob();
+}
+
 export async function createAccount(payload) {
   const res = await fetchWithAuth(`${API_V1}/register/`, {
   method: "POST",
@@ -230,8 +352,26 @@ export async function toggleUserStatus(userid) {
   return res.json();
 }
 
-export async function getActivityLogs() {
-  const res = await fetchWithAuth(`${API_V1}/activity-logs/`, {
+// With cursor or pageSize the response is { results, next_cursor };
+// otherwise a plain list of the latest 100 entries
+export async function getActivityLogs({
+  cursor,
+  pageSize,
+  action,
+  targetUser,
+  since,
+  until,
+} = {}) {
+  const params = new URLSearchParams();
+  if (cursor) params.set("cursor", cursor);
+  if (pageSize) params.set("page_size", String(pageSize));
+  if (action) params.set("action", action);
+  if (targetUser) params.set("target_user", targetUser);
+  if (since) params.set("since", since);
+  if (until) params.set("until", until);
+  const qs = params.toString() ? `?${params.toString()}` : "";
+
+  const res = await fetchWithAuth(`${API_V1}/activity-logs/${qs}`, {
     method: "GET",
   });
 
@@ -241,4 +381,35 @@ export async function getActivityLogs() {
   }
 
   return res.json();
-}
\ No newline at end of file
+}
+
+export async function exportIssues({ fileFormat = "csv", status } = {}) {
+  const params = new URLSearchParams({ file_format: fileFormat });
+  if (status) params.set("status", status);
+
+  const res = await fetchWithAuth(
+    `${API_BASE}/restapi/issues/export/?${params.toString()}`
+  );
+
+  if (!res.ok) {
+    throw new Error("Failed to export issues");
+  }
+
+  return res.blob();
+}
+
+export async function searchIssues({ q, status, page = 1, pageSize } = {}) {
+  const params = new URLSearchParams({ q, page: String(page) });
+  if (status) params.set("status", status);
+  if (pageSize) params.set("page_size", String(pageSize));
+
+  const res = await fetchWithAuth(
+    `${API_BASE}/restapi/issues/search/?${params.toString()}`
+  );
+
+  if (!res.ok) {
+    throw new Error("Failed to search issues");
+  }
+
+  return res.json();
+}
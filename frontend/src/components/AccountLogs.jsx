@@ -12,18 +12,30 @@ import {
   LogOut,
 } from "lucide-react";
 
+const PAGE_SIZE = 50;
+
 const AccountLogs = () => {
   const [logs, setLogs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
   const [filter, setFilter] = useState("all");
 
+  const fetchPage = (cursor) =>
+    getActivityLogs({
+      cursor,
+      pageSize: PAGE_SIZE,
+      action: filter === "all" ? undefined : filter,
+    });
+
   const loadLogs = async () => {
     setLoading(true);
     setError("");
     try {
-      const data = await getActivityLogs();
-      setLogs(data);
+      const data = await fetchPage();
+      setLogs(data.results);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError("Failed to load activity logs: " + err.message);
     } finally {
@@ -31,9 +43,23 @@ const AccountLogs = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    setError("");
+    try {
+      const data = await fetchPage(nextCursor);
+      setLogs((prev) => [...prev, ...data.results]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      setError("Failed to load activity logs: " + err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadLogs();
-  }, []);
+  }, [filter]);
 
   const getActionIcon = (action) => {
     switch (action) {
@@ -85,9 +111,6 @@ const AccountLogs = () => {
     });
   };
 
-  const filteredLogs =
-    filter === "all" ? logs : logs.filter((log) => log.action === filter);
-
   const actionTypes = [
     { value: "all", label: "All Actions" },
     { value: "create", label: "Account Created" },
@@ -142,7 +165,7 @@ const AccountLogs = () => {
         <div className="bg-white rounded-lg shadow border flex-1 overflow-hidden flex flex-col">
           <div className="bg-gray-50 border-b px-6 py-4">
             <p className="text-sm font-semibold text-gray-600">
-              Showing {filteredLogs.length} of {logs.length} logs
+              Showing {logs.length} logs{nextCursor ? " (more available)" : ""}
             </p>
           </div>
 
@@ -152,13 +175,13 @@ const AccountLogs = () => {
                 <div className="h-10 w-10 border-4 border-gray-300 border-t-black rounded-full animate-spin mb-3" />
                 <p className="text-gray-500 text-sm">Loading logs...</p>
               </div>
-            ) : filteredLogs.length === 0 ? (
+            ) : logs.length === 0 ? (
               <div className="text-center py-12 text-gray-500">
                 No activity logs found
               </div>
             ) : (
               <div className="divide-y">
-                {filteredLogs.map((log) => (
+                {logs.map((log) => (
                   <div
                     key={log.id}
                     className="px-6 py-4 hover:bg-gray-50 transition"
@@ -212,6 +235,20 @@ const AccountLogs = () => {
                     </div>
                   </div>
                 ))}
+
+                {nextCursor && (
+                  <div className="px-6 py-4 flex justify-center">
+                    <button
+                      onClick={loadMore}
+                      disabled={loadingMore}
+                      className="px-4 py-2 bg-gray-200 hover:bg-gray-300 rounded-lg 
+                               font-semibold transition flex items-center gap-2"
+                    >
+                      {loadingMore && <RefreshCw className="w-4 h-4 animate-spin" />}
+                      Load more
+                    </button>
+                  </div>
+                )}
               </div>
             )}
           </div>
@@ -13,6 +13,7 @@ import {
 } from "lucide-react";
 
 import ScreenBlocker from "./ScreenBlocker";
+import { logout } from "../api";
 
 function DashboardHome({ isRoot }) {
   const navigate = useNavigate();
@@ -184,9 +185,8 @@ function Dashboard() {
       : []),
   ];
 
-  const handleLogout = () => {
-    localStorage.removeItem("rm_access");
-    localStorage.removeItem("rm_refresh");
+  const handleLogout = async () => {
+    await logout();
     navigate("/", { replace: true });
   };
 
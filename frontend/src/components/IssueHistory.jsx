@@ -2,11 +2,15 @@ import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { getIssues } from "../api";
 
+const PAGE_SIZE = 50;
+
 const IssueHistory = () => {
   const navigate = useNavigate();
 
   const [history, setHistory] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
 
   useEffect(() => {
@@ -14,11 +18,12 @@ const IssueHistory = () => {
     setLoading(true);
     setError("");
 
-    //  Fetch ONLY resolved issues
-    getIssues("resolved")
+    //  Fetch ONLY resolved issues, one page at a time
+    getIssues("resolved", { pageSize: PAGE_SIZE })
       .then((data) => {
         if (!mounted) return;
-        setHistory(data);
+        setHistory(data.results);
+        setNextCursor(data.next_cursor);
       })
       .catch((err) => {
         console.error(err);
@@ -34,6 +39,24 @@ const IssueHistory = () => {
     };
   }, []);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    setError("");
+    try {
+      const data = await getIssues("resolved", {
+        cursor: nextCursor,
+        pageSize: PAGE_SIZE,
+      });
+      setHistory((prev) => [...prev, ...data.results]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      console.error(err);
+      setError("Failed to load issue history");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   return (
     <div>
       <h1 className="text-3xl font-bold text-black mb-6">
@@ -94,6 +117,18 @@ const IssueHistory = () => {
               </div>
             </div>
           ))}
+
+        {!loading && !error && nextCursor && (
+          <div className="px-6 py-4 flex justify-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-4 py-2 bg-gray-200 hover:bg-gray-300 rounded-lg font-semibold transition"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );